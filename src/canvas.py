@@ -0,0 +1,90 @@
+import numpy as np
+from numpy.typing import NDArray
+
+from objects.bounding_volume_hierarchy import ranges_to_indices
+from objects.geometricObject import Colour
+
+MARGIN = 20
+"""Clipping margin"""
+PIXEL_TOLERANCE = 0.5
+"""Maximum distance in pixels between curves and the lines drawn for them"""
+LINE_WIDTH = 2
+"""Width in pixels of lines and points"""
+BACKGROUND_COLOUR: Colour = (61, 61, 61)
+CLIPPING_AREA_COLOUR: Colour = (79, 79, 79)
+SELECTED_COLOUR: Colour = (246, 158, 67)
+Primitives = tuple[
+    NDArray[np.float64],
+    NDArray[np.int64],
+    NDArray[np.float64],
+    NDArray[np.float64],
+    NDArray[np.float64],
+]
+"""
+Pixels and sizes of the faces, point pairs of the outlines of the faces,
+point pairs of the lines and polylines and points of an object
+"""
+
+
+def to_pixels(
+    size: tuple[int, int],
+    coordinates: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """
+    Converts window coordinates into pixel coordinates of a canvas
+
+    @note Does the same as `Window.get_xw` and `Window.get_yw` for many vertices
+
+    @param size: Size of the clipping area of the canvas
+    @param coordinates: Window coordinates with shape (vertices, 4)
+
+    @returns: Pixel coordinates with shape (vertices, 2)
+    """
+    return ((coordinates[:, :2] * (1, -1) + 1) / 2) * size + MARGIN
+
+
+def window_tolerance(size: tuple[int, int]) -> float:
+    """
+    Converts the pixel tolerance of curves into window coordinates
+
+    @param size: Size of the clipping area of the canvas
+
+    @returns: Tessellation tolerance for a canvas of that size
+    """
+    # the window spans 2 units over the size of the canvas
+    return 2 * PIXEL_TOLERANCE / max(1, *size)
+
+
+def split_primitives(
+    pixels: NDArray[np.float64],
+    sizes: NDArray[np.int64],
+    polylines: bool,
+) -> Primitives:
+    """
+    Splits the primitives of an object by how they are drawn
+
+    @param pixels: Pixel coordinates of all primitives with shape (vertices, 2)
+    @param sizes: Amount of vertices of each primitive
+    @param polylines: Whether primitives of more than 2 vertices are open polylines
+
+    @returns: Primitives ready to be drawn
+    """
+    ends = np.cumsum(sizes)
+    starts = ends - sizes
+
+    # lines and polylines are drawn as the pairs of their consecutive vertices
+    opened = (sizes == 2) | ((sizes > 2) & polylines)
+    first = ranges_to_indices(starts[opened], ends[opened] - 1)
+
+    closed = (sizes > 2) & ~opened
+    vertices = ranges_to_indices(starts[closed], ends[closed])
+    following = vertices + 1
+    following[np.cumsum(sizes[closed]) - 1] = starts[closed]
+
+    return (
+        pixels[vertices],
+        sizes[closed],
+        np.stack((pixels[vertices], pixels[following]), axis=1).reshape(-1, 2),
+        pixels[first[:, None] + np.arange(2)].reshape(-1, 2),
+        pixels[starts[sizes == 1]],
+    )
@@ -1,21 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, RLock
+
 import numpy as np
 from numpy.typing import NDArray
 
+from objects.bounding_volume_hierarchy import BoundingVolumeHierarchy
 from objects.clipping import ClippingAlgo
-from objects.geometricObject import GeometricObject
+from objects.geometricObject import (
+    TOLERANCE,
+    GeometricObject,
+    Subdivision,
+    Tessellator,
+)
+from tessellationService import TessellationService
+
+Frame = list[tuple[int, GeometricObject, list[NDArray[np.float64]]]]
+"""Visible objects with their index and the window coordinates they had when evaluated"""
 
 
 class DisplayFile:
     """The Display File holds all objetcts in the scene"""
-    def __init__(self, clipping_algorithm: ClippingAlgo) -> None:
+    def __init__(self, clipping_algorithm: ClippingAlgo, workers: int = 1) -> None:
         """
         Creates the Display File
+
+        @param clipping_algorithm: Clipping algorithm to use on edges
+        @param workers: Amount of threads evaluating objects, see `set_workers`
         """
         self._clipping_algorithm = clipping_algorithm
         self._objects: list[GeometricObject] = []
         self._scn_matrix: NDArray[np.float64] = np.array(
             [[0, 0, 0], [0, 0, 0], [0, 0, 1]],
         )
+        # the vertices of the whole scene are packed into a single buffer
+        # so a change of the window is a single matrix multiplication
+        self._vertices: NDArray[np.float64] = np.empty((0, 4))
+        """Vertices of all objects, one object after the other"""
+        self._object_offsets: NDArray[np.int64] = np.zeros(1, dtype=np.int64)
+        """Where each object starts in the vertex buffer, plus the end of the last"""
+        self._object_sizes: NDArray[np.int64] = np.zeros(0, dtype=np.int64)
+        """Amount of vertices of each object"""
+        self._object_primitives: NDArray[np.int64] = np.zeros(1, dtype=np.int64)
+        """Where the primitives of each object start in the primitive tables"""
+        self._primitive_offsets: NDArray[np.int64] = np.zeros(1, dtype=np.int64)
+        """Where each primitive starts in the vertex buffer, plus the end of the last"""
+        self._primitive_sizes: NDArray[np.int64] = np.zeros(0, dtype=np.int64)
+        """Amount of vertices of each primitive"""
+        self._packed = True
+        """Whether the buffer and the hierarchy match the objects list"""
+        self._hierarchy = BoundingVolumeHierarchy()
+        self._visible: NDArray[np.int64] | None = np.empty(0, dtype=np.int64)
+        """Indices of the objects reaching the window, None when it must be queried"""
+        self._inside: NDArray[np.bool_] = np.empty(0, dtype=np.bool_)
+        """Which of the visible objects are fully inside the window"""
+        self._outdated = False
+        """Whether the window or the clipping changed since the last evaluation"""
+        # evaluations may run in another thread, changes bump the generation
+        # first so a running evaluation stops early and releases the lock
+        self._lock = RLock()
+        self._generation = 0
+        """Incremented on every change to the scene or the window"""
+        self._workers = 1
+        self._executor: ThreadPoolExecutor | None = None
+        self._projection: NDArray[np.float64] | None = None
+        """Normalised scene of the running evaluation, if needed"""
+        self._projection_lock = Lock()
+        self._tessellation: TessellationService | None = None
+        """Processes tessellating curves and surfaces, None to do it in this one"""
+        self._tolerance = TOLERANCE
+        """Maximum distance between curves and their lines in window coordinates"""
+        self.set_workers(workers)
 
     def at(self, index: int) -> GeometricObject:
         """
@@ -33,8 +87,20 @@ class DisplayFile:
 
         @param obj: The geometric object to include into the world
         """
-        self._objects.append(obj)
-        obj.set_window_coordinates(self._scn_matrix, self._clipping_algorithm)
+        self._generation += 1
+
+        with self._lock:
+            self._objects.append(obj)
+            self._packed = False
+            self._visible = None
+            obj.add_transform_listener(self._object_transformed)
+            obj.set_tessellation_tolerance(self._tolerance)
+            obj.invalidate_window_coordinates(
+                self._scn_matrix,
+                self._clipping_algorithm,
+            )
+            # evaluated with the others by the workers and the tessellation processes
+            self._outdated = True
 
     def remove(self, index: int) -> None:
         """
@@ -42,7 +108,32 @@ class DisplayFile:
 
         @param index: Index of the object, this should be equal to the list in the UI
         """
-        self._objects.pop(index)
+        self._generation += 1
+
+        with self._lock:
+            obj = self._objects.pop(index)
+            self._packed = False
+            self._visible = None
+            obj.remove_transform_listener(self._object_transformed)
+
+    def transform(
+        self,
+        obj: GeometricObject,
+        transform_matrix: NDArray[np.float64],
+    ) -> None:
+        """
+        Transforms an object of the display file
+
+        @note The object is changed while holding the lock, so an evaluation
+              running on another thread never sees it half transformed
+
+        @param obj: Object to transform
+        @param transform_matrix: Transformation matrix to apply on the object
+        """
+        self._generation += 1
+
+        with self._lock:
+            obj.transform(transform_matrix, self._scn_matrix, self._clipping_algorithm)
 
     def objects(self) -> list[GeometricObject]:
         """
@@ -52,17 +143,408 @@ class DisplayFile:
         """
         return self._objects
 
-    def set_scn_matrix(self, matrix: NDArray[np.float64]) -> None:
+    def get_generation(self) -> int:
+        """
+        Returns a number that changes whenever the scene or the window changes
+
+        @returns: Current generation, to be given to `get_frame`
+        """
+        return self._generation
+
+    def get_frame(
+        self,
+        generation: int | None = None,
+        tolerance: float | None = None,
+    ) -> Frame | None:
+        """
+        Evaluates the visible objects and returns their window coordinates
+
+        @note Safe to call from a worker thread, changes made meanwhile wait
+              for the object being evaluated and then cancel the rest
+
+        @param generation: Generation the frame is for, None to never cancel
+        @param tolerance: Tessellation tolerance of this frame only, None to use
+        the one of the display file, which is restored afterwards
+
+        @returns: The evaluated frame, None when a newer change cancelled it
+        """
+        if tolerance is not None and tolerance != self._tolerance:
+            with self._lock:
+                if generation is not None and generation != self._generation:
+                    return None
+
+                previous = self._tolerance
+                self.set_tessellation_tolerance(tolerance)
+
+                try:
+                    return self.get_frame(
+                        None if generation is None else self._generation,
+                    )
+                finally:
+                    self.set_tessellation_tolerance(previous)
+
+        with self._lock:
+            if self._outdated and not self._update_window_coordinates(generation):
+                return None
+
+            frame: Frame = []
+
+            for index in self._visible_indices():
+                if generation is not None and generation != self._generation:
+                    return None
+
+                obj = self._objects[index]
+                frame.append((index, obj, obj.get_window_coordinates()))
+
+            return frame
+
+    def set_scn_matrix(
+        self,
+        matrix: NDArray[np.float64],
+        scale: float | None = None,
+        offset: NDArray[np.float64] | None = None,
+    ) -> None:
         """
         Sets the matrix that transform global coordinates into SCN coordinates
 
+        @note When a scale or an offset is given the new window coordinates are
+              the previous ones scaled then offset, so objects only need to be
+              clipped again instead of projected and tessellated
+
         @param matrix: Matrix to transform the global coordinates into SCN coordinates
+        @param scale: Factor applied to X and Y of the previous window coordinates
+        @param offset: Amount added to X, Y and Z of the previous window coordinates
         """
-        self._scn_matrix = matrix
-        for obj in self._objects:
-            obj.set_window_coordinates(matrix, self._clipping_algorithm)
+        self._generation += 1
+
+        with self._lock:
+            self._scn_matrix = matrix
+            self._visible = None
+            self._invalidate_window_coordinates(scale, offset)
+
+    def set_workers(self, workers: int) -> None:
+        """
+        Sets how many threads evaluate the window coordinates of the objects
+
+        @note With more than one worker the visible objects are split in chunks
+              with about the same amount of vertices, each evaluated by a thread
+
+        @param workers: Amount of threads, 1 evaluates on the calling thread
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+
+            self._workers = max(1, workers)
+            self._executor = (
+                ThreadPoolExecutor(max_workers=self._workers)
+                if self._workers > 1 else None
+            )
+
+    def shutdown(self) -> None:
+        """
+        Stops the threads evaluating the objects and the tessellation processes
+        """
+        self.set_workers(1)
+        self.set_tessellation_processes(0)
+
+    def set_tessellation_processes(self, processes: int) -> None:
+        """
+        Sets how many processes tessellate curves and surfaces
+
+        @note Tessellation is pure Python and holds the GIL, so threads
+              don't help it, processes do
+
+        @param processes: Amount of processes, 0 tessellates in this process
+        """
+        with self._lock:
+            if self._tessellation is not None:
+                self._tessellation.shutdown()
+
+            self._tessellation = (
+                TessellationService(processes) if processes > 0 else None
+            )
+
+    def set_tessellation_tolerance(self, tolerance: float) -> None:
+        """
+        Sets how far curves and surfaces may be from the lines drawn for them
+
+        @note Curves are split until their lines are within the tolerance,
+              so a smaller one draws smoother curves with more lines
+
+        @param tolerance: Maximum distance in window coordinates
+        """
+        self._generation += 1
+
+        with self._lock:
+            self._tolerance = tolerance
+
+            for obj in self._objects:
+                obj.set_tessellation_tolerance(tolerance)
+
+            self._invalidate_window_coordinates()
 
     def set_clipping_algorithm(self, clipping_algorithm: ClippingAlgo) -> None:
-        self._clipping_algorithm = clipping_algorithm
+        self._generation += 1
+
+        with self._lock:
+            self._clipping_algorithm = clipping_algorithm
+            # the unclipped coordinates are still valid, only clipping changes
+            self._invalidate_window_coordinates(scale=1.)
+
+    def _invalidate_window_coordinates(
+        self,
+        scale: float | None = None,
+        offset: NDArray[np.float64] | None = None,
+    ) -> None:
+        """
+        Marks the window coordinates of every object as outdated
+
+        @note Nothing is evaluated here, only when the coordinates are requested
+
+        @param scale: Factor applied to X and Y of the previous window coordinates
+        @param offset: Amount added to X, Y and Z of the previous window coordinates
+        """
         for obj in self._objects:
-            obj.set_window_coordinates(self._scn_matrix, self._clipping_algorithm)
+            obj.invalidate_window_coordinates(
+                self._scn_matrix,
+                self._clipping_algorithm,
+                scale,
+                offset,
+            )
+
+        self._outdated = True
+
+    def _pack(self) -> None:
+        """
+        Rebuilds the vertex buffer and its tables from the objects list
+
+        @note Adding or removing objects only flags the buffer, so importing
+              many objects does not copy the whole scene on every insertion
+        """
+        vertices = [obj.get_vertices() for obj in self._objects]
+        offsets = [obj.get_primitive_offsets() for obj in self._objects]
+        self._object_sizes = np.array([len(v) for v in vertices], dtype=np.int64)
+        self._object_offsets = np.concatenate(
+            ([0], np.cumsum(self._object_sizes)),
+        ).astype(np.int64)
+        self._object_primitives = np.concatenate(
+            ([0], np.cumsum([len(o) - 1 for o in offsets])),
+        ).astype(np.int64)
+
+        if len(vertices) == 0:
+            self._vertices = np.empty((0, 4))
+            self._primitive_offsets = np.zeros(1, dtype=np.int64)
+        else:
+            self._vertices = np.concatenate(vertices)
+            self._primitive_offsets = np.concatenate([
+                o[:-1] + start for o, start in zip(offsets, self._object_offsets)
+            ] + [self._object_offsets[-1:]]).astype(np.int64)
+
+        self._primitive_sizes = np.diff(self._primitive_offsets)
+        self._hierarchy.build(np.array([obj.get_bounding_box() for obj in self._objects]))
+        self._packed = True
+
+    def _object_transformed(self, obj: GeometricObject) -> None:
+        """
+        Copies the new vertices of a transformed object into the vertex buffer
+
+        @param obj: The object that was transformed
+        """
+        self._generation += 1
+
+        with self._lock:
+            # an evaluation running while it was transformed may have used the
+            # old vertices, so the object is marked as outdated again
+            obj.invalidate_tessellation()
+            obj.invalidate_window_coordinates(self._scn_matrix, self._clipping_algorithm)
+            self._outdated = True
+
+            if not self._packed:
+                return
+
+            index = self._objects.index(obj)
+            start, end = self._object_offsets[index:index + 2]
+            self._vertices[start:end] = obj.get_vertices()
+            self._hierarchy.refit(index, obj.get_bounding_box())
+            self._visible = None
+
+    def _visible_indices(self) -> NDArray[np.int64]:
+        """
+        Returns the indices of the objects that reach the window
+
+        @note The hierarchy is only queried again after something changed
+        """
+        if not self._packed:
+            self._pack()
+
+        if self._visible is None:
+            self._visible, self._inside = self._hierarchy.query(self._scn_matrix)
+
+        return self._visible
+
+    def _update_window_coordinates(self, generation: int | None = None) -> bool:
+        """
+        Hands each visible object the projected scene to be clipped
+
+        @note Objects outside the window are left outdated, they are
+              evaluated if their coordinates are requested
+
+        @param generation: Generation being evaluated, None to never cancel
+
+        @returns: False when a newer change cancelled the evaluation
+        """
+        visible = self._visible_indices()
+        self._projection = None
+        deferred: list[tuple[int, bool, Subdivision, Tessellator]] | None = (
+            None if self._tessellation is None else []
+        )
+
+        if self._executor is None or len(visible) < 2:
+            evaluated = self._evaluate_objects(
+                visible,
+                self._inside,
+                generation,
+                deferred,
+            )
+        else:
+            # contiguous chunks with about the same amount of vertices each,
+            # counting the lines of curves and surfaces instead of their control points
+            vertices = np.cumsum([
+                self._objects[index].get_evaluation_size() for index in visible
+            ])
+            bounds = np.searchsorted(
+                vertices,
+                np.linspace(0, vertices[-1], self._workers + 1)[1:-1],
+            )
+            # every chunk must stop before the lock is released, even if one cancelled
+            evaluated = all(list(self._executor.map(
+                lambda chunk: self._evaluate_objects(
+                    visible[chunk],
+                    self._inside[chunk],
+                    generation,
+                    deferred,
+                ),
+                np.split(np.arange(len(visible)), bounds),
+            )))
+
+        if self._tessellation is not None and evaluated and deferred:
+            evaluated = self._tessellate_objects(
+                self._tessellation,
+                deferred,
+                generation,
+            )
+
+        self._projection = None
+        self._outdated = not evaluated
+
+        return evaluated
+
+    def _evaluate_objects(
+        self,
+        indices: NDArray[np.int64],
+        inside: NDArray[np.bool_],
+        generation: int | None,
+        deferred: list[tuple[int, bool, Subdivision, Tessellator]] | None = None,
+    ) -> bool:
+        """
+        Evaluates the window coordinates of some of the visible objects
+
+        @note After a pan or a zoom the objects only scale and move their
+              previous coordinates, the scene is projected only if needed.
+              Curves and surfaces project their own cached lines instead
+
+        @param indices: Indices of the objects to evaluate
+        @param inside: Which of the objects are fully inside the window
+        @param generation: Generation being evaluated, None to never cancel
+        @param deferred: When given, objects whose tessellation is outdated are
+        added to it with whether they are inside, their subdivision and their
+        tessellator instead
+
+        @returns: False when a newer change cancelled the evaluation
+        """
+        for index, obj_inside in zip(indices, inside):
+            # objects left behind stay outdated, so cancelling keeps them consistent
+            if generation is not None and generation != self._generation:
+                return False
+
+            obj = self._objects[index]
+
+            # already evaluated by itself for the current window
+            if not obj.window_coordinates_outdated():
+                continue
+
+            if obj.reuse_window_coordinates(obj_inside):
+                continue
+
+            subdivision = obj.get_subdivision(self._scn_matrix)
+            tessellator = obj.get_tessellator(subdivision)
+
+            if tessellator is not None:
+                if deferred is not None and obj.tessellation_outdated(subdivision):
+                    deferred.append((index, obj_inside, subdivision, tessellator))
+                    continue
+
+                obj.project_primitives(
+                    self._scn_matrix,
+                    self._clipping_algorithm,
+                    obj_inside,
+                )
+                continue
+
+            start, end = self._object_offsets[index:index + 2]
+            obj.set_projected_coordinates(
+                self._project()[start:end],
+                self._clipping_algorithm,
+                obj_inside,
+            )
+
+        return True
+
+    def _tessellate_objects(
+        self,
+        tessellation: TessellationService,
+        deferred: list[tuple[int, bool, Subdivision, Tessellator]],
+        generation: int | None,
+    ) -> bool:
+        """
+        Tessellates curves and surfaces in the tessellation processes, all at once
+
+        @note Only objects transformed since their last tessellation, or needing
+              another subdivision, are sent
+
+        @param tessellation: Service running the tessellation processes
+        @param deferred: Index of the objects, whether they are inside the window,
+        their subdivision and their tessellator
+        @param generation: Generation being evaluated, None to never cancel
+
+        @returns: False when a newer change cancelled the evaluation
+        """
+        polylines = tessellation.tessellate([
+            (tessellator, self._objects[index].get_vertices())
+            for index, _, _, tessellator in deferred
+        ])
+
+        # the objects are still outdated, so they can be left as they are
+        if generation is not None and generation != self._generation:
+            return False
+
+        for (index, inside, subdivision, _), tessellated in zip(deferred, polylines):
+            obj = self._objects[index]
+            obj.set_tessellation(tessellated, subdivision)
+            obj.project_primitives(self._scn_matrix, self._clipping_algorithm, inside)
+
+        return True
+
+    def _project(self) -> NDArray[np.float64]:
+        """
+        Projects the whole scene once per evaluation, shared by all workers
+
+        @returns: Projected vertices after the homogeneous divide
+        """
+        with self._projection_lock:
+            if self._projection is None:
+                projected = self._vertices @ self._scn_matrix
+                self._projection = projected / projected[:, -1:]
+
+            return self._projection
@@ -310,7 +310,8 @@ class WavefrontDescriptor:
 
                         continue
                     elif isinstance(obj, BezierSurface):
-                        coords = obj_group[0].reshape(16, 4)
+                        control_points = obj_group[0]
+                        coords = control_points.reshape(-1, 4)
 
                         for coord in coords:
                             file.write("v {:.6f} {:.6f} {:.6f}\n".format(
@@ -335,8 +336,17 @@ class WavefrontDescriptor:
                                 ],
                             ),
                         ))
-                        file.write("parm u 0.000000 1.000000\n")
-                        file.write("parm v 0.000000 1.000000\n")
+                        # one parameter at each patch border
+                        patches = (control_points.shape[0] - 1) // 3
+                        parm_ls = [(i / patches) for i in range(patches + 1)]
+                        file.write("parm u {}\n".format(
+                            " ".join(["{:.6f}".format(u) for u in parm_ls]),
+                        ))
+                        patches = (control_points.shape[1] - 1) // 3
+                        parm_ls = [(i / patches) for i in range(patches + 1)]
+                        file.write("parm v {}\n".format(
+                            " ".join(["{:.6f}".format(v) for v in parm_ls]),
+                        ))
                         file.write("end\n")
 
                         continue
@@ -465,7 +475,16 @@ class CurveImport:
         try:
             if self._surface:
                 if self._type == "bezier":
-                    return BezierSurface(name, colour, self._points)
+                    return BezierSurface(
+                        name,
+                        colour,
+                        np.array(self._points).reshape(
+                            # control points = (knots - 1) * degree + 1
+                            (self._knots["u"] - 1) * self._degrees[0] + 1,
+                            (self._knots["v"] - 1) * self._degrees[1] + 1,
+                            4,
+                        ),
+                    )
 
                 return BSplineSurface(
                     name,
@@ -1,15 +1,127 @@
-import math
+from functools import partial
+
 import numpy as np
 from numpy.typing import NDArray
 
-from objects.clipping import ClippingAlgo
-from objects.geometricObject import Colour, GeometricObject, VerticesList
+from objects.geometricObject import (
+    Colour,
+    GeometricObject,
+    Subdivision,
+    Tessellator,
+    VerticesList,
+)
+
+W_CROSSING_DEPTH = 5
+"""
+Depth of curves that may cross the plane where W is zero, about the 25 lines
+curves were always split in before the depth followed the tolerance
+"""
+
+
+def bernstein_matrix(smoothness: int) -> NDArray[np.float64]:
+    """
+    Computes the cubic Bernstein weights of evenly spaced parameters
+
+    @param smoothness: Amount of lines, there is one parameter more than lines
+
+    @returns: Matrix of shape (smoothness + 1, 4) with the weights of each parameter
+    """
+    t = (np.arange(smoothness + 1) / smoothness)[:, None]
+
+    return np.hstack((
+        1 - 3 * t + 3 * t ** 2 - t ** 3,
+        3 * t - 6 * t ** 2 + 3 * t ** 3,
+        3 * t ** 2 - 3 * t ** 3,
+        t ** 3,
+    ))
+
+
+def subdivision_depth(
+    polygons: NDArray[np.float64],
+    tolerance: float,
+    max_depth: int,
+) -> int:
+    """
+    Finds how many times cubic Bezier curves must be halved to look straight
+
+    Halving a curve divides the second differences of its control points by 4,
+    so the depth where recursive subdivision passes the flatness test is found
+    directly instead of splitting the curves
+
+    @note All curves share the depth of the least flat one, so the polylines
+          of an object all have the same length and are built and packed together
+
+    @note Curves that may cross the plane where W is zero have no flatness,
+          they use `W_CROSSING_DEPTH` unless the other curves need more
+
+    @param polygons: Projected control points of each curve, shape (..., 4, 4)
+    @param tolerance: Maximum distance between the curves and their lines
+    @param max_depth: Depth to never go beyond
+
+    @returns: Depth, each curve is split in 2 ** depth lines
+    """
+    w = polygons[..., 3]
+    crossing = ~((w > 0).all(axis=-1) | (w < 0).all(axis=-1))
+    depth = min(max_depth, W_CROSSING_DEPTH) if crossing.any() else 0
+
+    same_side = polygons[~crossing]
+    points = same_side[..., :2] / same_side[..., 3:]
+    second = points[..., :-2, :] - 2 * points[..., 1:-1, :] + points[..., 2:, :]
+    # a cubic split in n lines is at most 3/4 of its second differences / n² away
+    flatness = 0.75 * np.linalg.norm(second, axis=-1).max(initial=0)
+
+    if flatness <= tolerance:
+        return depth
+
+    return max(depth, int(min(max_depth, np.ceil(np.log2(flatness / tolerance) / 2))))
+
+
+def segment_indices(control_points: int) -> NDArray[np.int64]:
+    """
+    Returns the indices of the control points of each segment of a Bezier curve
+
+    @param control_points: Amount of control points, 4 for the first segment
+    and 3 more for each other segment
+
+    @returns: Indices of shape (segments, 4)
+    """
+    # each segment starts on the last control point of the previous one
+    return np.arange((control_points - 1) // 3)[:, None] * 3 + np.arange(4)
+
+
+def tessellate_bezier_curve(
+    control_points: NDArray[np.float64],
+    depth: int,
+    visible: NDArray[np.bool_],
+) -> NDArray[np.float64]:
+    """
+    Builds the polylines of a Bezier curve, one per segment
+
+    @note All segments are evaluated together with a single matrix multiplication
+
+    @param control_points: Control points, 4 for the first segment
+    and 3 more for each other segment
+    @param depth: Each segment is split in 2 ** depth lines
+    @param visible: Mask of the segments to build
+
+    @returns: Polylines of shape (segments, 2 ** depth + 1, 4)
+    after the homogeneous divide
+    """
+    points = bernstein_matrix(2 ** depth) @ control_points[
+        segment_indices(len(control_points))[visible]
+    ]
+
+    return points / points[:, :, -1:]
 
 
 class BezierCurve(GeometricObject):
     """
     A Bezier Curve consists of multiple points identifying the Pi points in the curve
     """
+    POLYLINES = True
+    MAX_DEPTH = 7
+    """Each segment is split in at most 2 ** MAX_DEPTH lines"""
+
     def __init__(
         self,
         name: str,
@@ -29,54 +141,17 @@ class BezierCurve(GeometricObject):
             [curve_points],
         )
 
-    def set_window_coordinates(
-        self,
-        win_coords_matrix: NDArray[np.float64],
-        line_clip: ClippingAlgo,
-    ) -> None:
-        win_bezier = [coords @ win_coords_matrix for coords in self._coordinates[0]]
-        self._window_coordinates = []
-        lines = []
-
-        for i in range(0, len(win_bezier) - 1, 3):
-            p1, p2, p3, p4 = win_bezier[i:i + 4]
-            prev_vertex = np.array([])
-            # points_diff = np.abs(p4[:2] - p1[:2])
-            # base smoothness is the amount of lines for half screen
-            # base_smoothness = 25
-            # adjust smoothness according to zoom
-            # smoothness = math.ceil(points_diff.max() * base_smoothness)
-            smoothness = 25
-
-            for t_int in range(smoothness + 1):
-                t = t_int / smoothness
-                v = (
-                    1 - 3 * t + 3 * t ** 2 - t ** 3,
-                    3 * t - 6 * t ** 2 + 3 * t ** 3,
-                    3 * t ** 2 - 3 * t ** 3,
-                    t ** 3,
-                )
-                new_vertex = p1 * v[0] + p2 * v[1] + p3 * v[2] + p4 * v[3]
-
-                if t_int > 0:
-                    lines.append(np.array([prev_vertex, new_vertex]))
-
-                prev_vertex = new_vertex
-
-        np_lines = np.array(lines)
-        np_lines = np_lines / np_lines[:, :, -1:]
-
-        for win_coords in np_lines:
-            obj = None
-
-            if line_clip == ClippingAlgo.Points:
-                obj = self.clip_by_point(win_coords)
-            elif line_clip == ClippingAlgo.CohenSutherland:
-                obj = self.clip_cohen_sutherland(win_coords)
-            elif line_clip == ClippingAlgo.LiangBarsky:
-                obj = self.clip_liang_barsky(win_coords)
-            elif line_clip == ClippingAlgo.NichollLeeNicholl:
-                obj = self.clip_nicholl_lee_nicholl(win_coords)
-
-            if obj is not None:
-                self._window_coordinates.append(obj)
+    def get_tessellator(self, subdivision: Subdivision) -> Tessellator:
+        depth, visible = subdivision
+
+        return partial(tessellate_bezier_curve, depth=depth, visible=visible)
+
+    def get_subdivision(self, win_coords_matrix: NDArray[np.float64]) -> Subdivision:
+        projected = self._vertices @ win_coords_matrix
+        segments = projected[segment_indices(len(projected))]
+        visible = ~self.hull_outside_mask(segments)
+
+        return (
+            subdivision_depth(segments[visible], self._tolerance, self.MAX_DEPTH),
+            visible,
+        )
@@ -1,109 +1,126 @@
-import math
+from functools import partial
+
 import numpy as np
 from numpy.typing import NDArray
 
-from objects.clipping import ClippingAlgo
-from objects.geometricObject import Colour, GeometricObject, VerticesList
+from objects.bezier_curve import bernstein_matrix, subdivision_depth
+from objects.geometricObject import Colour, GeometricObject, Subdivision, Tessellator
+
+
+def bezier_patches(grid: NDArray[np.float64]) -> NDArray[np.float64]:
+    """
+    Splits a grid of control points into the 4x4 points of each patch
+
+    @param grid: Control points of shape (3m + 1, 3n + 1, coordinates)
+
+    @returns: Patches of shape (m * n, 4, 4, coordinates)
+    """
+    rows = np.arange((grid.shape[0] - 1) // 3)[:, None] * 3 + np.arange(4)
+    columns = np.arange((grid.shape[1] - 1) // 3)[:, None] * 3 + np.arange(4)
+
+    return grid[rows[:, None, :, None], columns[None, :, None, :]].reshape(
+        (-1, 4, 4) + grid.shape[2:],
+    )
+
+
+def tessellate_bezier_surface(
+    control_points: NDArray[np.float64],
+    shape: tuple[int, ...],
+    depth: int,
+    visible: NDArray[np.bool_],
+) -> NDArray[np.float64]:
+    """
+    Builds the polylines of a Bezier surface, curves along both directions
+
+    @note The grids of points of all patches are evaluated at once
+
+    @param control_points: Control points
+    @param shape: Shape of the control points grid, (3m + 1, 3n + 1, 4)
+    @param depth: Each patch has 2 ** depth + 1 curves per direction,
+    split in 2 ** depth lines
+    @param visible: Mask of the patches to build
+
+    @returns: Polylines of shape (curves, 2 ** depth + 1, 4)
+    after the homogeneous divide
+    """
+    basis = bernstein_matrix(2 ** depth)
+    patches = bezier_patches(control_points.reshape(shape))[visible]
+    # S @ P[..., k] @ T.T of each patch and coordinate k
+    points = np.moveaxis(basis @ np.moveaxis(patches, -1, 1) @ basis.T, 1, -1)
+    points = points / points[..., -1:]
+    # the curves along t, then the curves along s
+    return np.concatenate((
+        points.reshape(-1, len(basis), 4),
+        points.swapaxes(1, 2).reshape(-1, len(basis), 4),
+    ))
 
 
 class BezierSurface(GeometricObject):
     """
-    A Bezier Curve consists of multiple points identifying the Pi points in the curve
+    A Bezier Surface consists of patches of 4x4 points sharing their borders
     """
+    POLYLINES = True
+    MAX_DEPTH = 5
+    """Each patch is split in at most 2 ** MAX_DEPTH lines per direction"""
+
     def __init__(
         self,
         name: str,
         colour: Colour,
-        curve_points: VerticesList,
+        surface_points: NDArray[np.float64],
     ):
-        if len(curve_points) != 16:
-            raise ValueError("Bézier surfaces require exactly 16 points")
-
-        self._points = np.array(curve_points).reshape(4, 4, 4)
+        if (
+            len(surface_points.shape) != 3  # not 3D array
+            or surface_points.shape[0] < 4  # less than 4 points on s
+            or surface_points.shape[1] < 4  # less than 4 points on t
+            or surface_points.shape[0] % 3 != 1  # incomplete patch on s
+            or surface_points.shape[1] % 3 != 1  # incomplete patch on t
+            or surface_points.shape[2] != 4  # Points don't have 4 coords
+        ):
+            raise ValueError(
+                "Bézier surfaces require a matrix of 4x4 points plus 3 more "
+                "points for each other patch on each direction",
+            )
+
+        self._shape = surface_points.shape
+
+        control_points = list(surface_points.reshape(
+            (surface_points.shape[0] * surface_points.shape[1], 4),
+        ))
 
         super(BezierSurface, self).__init__(
             name,
             "BezierSurface",
             colour,
-            curve_points,
-            [],
+            control_points,
+            [tuple(control_points)],
         )
 
-    def bezier_line(
-        self,
-        lines: list[NDArray[np.float64]],
-        smoothness: int,
-        bezier_points: NDArray[np.float64],
-    ) -> None:
-        prev_vertex = np.array([])
-
-        for s_int in range(smoothness + 1):
-            s = s_int / smoothness
-            sv = np.array([
-                1 - 3 * s + 3 * s ** 2 - s ** 3,
-                3 * s - 6 * s ** 2 + 3 * s ** 3,
-                3 * s ** 2 - 3 * s ** 3,
-                s ** 3,
-            ])
-
-            for t_int in range(smoothness + 1):
-                t = t_int / smoothness
-                tv = np.array([
-                    1 - 3 * t + 3 * t ** 2 - t ** 3,
-                    3 * t - 6 * t ** 2 + 3 * t ** 3,
-                    3 * t ** 2 - 3 * t ** 3,
-                    t ** 3,
-                ])
-                new_vertex = np.array([
-                    sv @ bezier_points[:, :, 0] @ tv,
-                    sv @ bezier_points[:, :, 1] @ tv,
-                    sv @ bezier_points[:, :, 2] @ tv,
-                    sv @ bezier_points[:, :, 3] @ tv,
-                ])
-
-                if t_int > 0:
-                    lines.append(np.array([prev_vertex, new_vertex]))
-
-                prev_vertex = new_vertex
-
-    def set_window_coordinates(
-        self,
-        win_coords_matrix: NDArray[np.float64],
-        line_clip: ClippingAlgo,
-    ) -> None:
-        win_bezier = self._points @ win_coords_matrix
-        # print(win_bezier[0])
-        # print(win_bezier / win_bezier[:, :, -1])
-        # win_bezier = win_bezier / win_bezier[:, :, -1]
-        self._window_coordinates = []
-        lines: list[NDArray[np.float64]] = []
-
-        # p1, _, _, p4 = win_bezier[0][0:4]
-        # points_diff = np.abs(p4[:2] - p1[:2])
-        # base smoothness is the amount of lines for half screen
-        # base_smoothness = 25
-        # adjust smoothness according to zoom
-        # smoothness = max(2, math.ceil(points_diff.max() * base_smoothness))
-        smoothness = 25
-        self.bezier_line(lines, smoothness, win_bezier)
-        self.bezier_line(lines, smoothness, win_bezier.transpose(1, 0, 2))
-        np_lines = np.array(lines)
-        np_lines = np_lines / np_lines[:, :, -1:]
-
-        for win_coords in np_lines:
-            obj = None
-
-            if line_clip == ClippingAlgo.Points:
-                obj = self.clip_by_point(win_coords)
-            elif line_clip == ClippingAlgo.CohenSutherland:
-                obj = self.clip_cohen_sutherland(win_coords)
-            elif line_clip == ClippingAlgo.LiangBarsky:
-                obj = self.clip_liang_barsky(win_coords)
-            elif line_clip == ClippingAlgo.NichollLeeNicholl:
-                obj = self.clip_nicholl_lee_nicholl(win_coords)
-
-            if obj is not None:
-                self._window_coordinates.append(obj)
+    def get_tessellator(self, subdivision: Subdivision) -> Tessellator:
+        depth, visible = subdivision
+
+        return partial(
+            tessellate_bezier_surface,
+            shape=self._shape,
+            depth=depth,
+            visible=visible,
+        )
+
+    def get_subdivision(self, win_coords_matrix: NDArray[np.float64]) -> Subdivision:
+        projected = self._vertices @ win_coords_matrix
+        patches = bezier_patches(projected.reshape(self._shape))
+        visible = ~self.hull_outside_mask(patches.reshape(-1, 16, 4))
+        patches = patches[visible]
+
+        # the curves along t of each patch, then the curves along s
+        return (
+            subdivision_depth(
+                np.concatenate((patches, patches.swapaxes(1, 2))),
+                self._tolerance,
+                self.MAX_DEPTH,
+            ),
+            visible,
+        )
 
     def get_coordinates(self) -> list[NDArray[np.float64]]:
         """
@@ -111,19 +128,4 @@ class BezierSurface(GeometricObject):
 
         @returns: Tuple of global coordinates for each point
         """
-        return [self._points]
-
-    def transform(
-        self,
-        transform_matrix: NDArray[np.float64],
-        window_matrix: NDArray[np.float64],
-        line_clip: ClippingAlgo,
-    ) -> None:
-        """
-        Transform the object throught a tranformation matrix
-
-        @param transform_matrix: Transformation Matrix to apply on the obejct
-        """
-        self._points = self._points @ transform_matrix
-        self._center = self._center @ transform_matrix
-        self.set_window_coordinates(window_matrix, line_clip)
+        return [self._vertices.reshape(self._shape)]
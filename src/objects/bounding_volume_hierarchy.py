@@ -0,0 +1,206 @@
+import numpy as np
+from numpy.typing import NDArray
+
+BoundingBox = NDArray[np.float64]
+"""Axis aligned box as an array of shape (2, 3) holding the minimum and maximum"""
+
+_CORNERS = np.array([
+    [(corner >> axis) & 1 for axis in range(3)] for corner in range(8)
+])
+"""Which of minimum (0) or maximum (1) each of the 8 corners of a box uses per axis"""
+
+
+def ranges_to_indices(
+    starts: NDArray[np.int64],
+    ends: NDArray[np.int64],
+) -> NDArray[np.int64]:
+    """
+    Concatenates many `range(start, end)` into a single array
+
+    @param starts: First index of each range
+    @param ends: End (exclusive) of each range
+
+    @returns: All indices of all ranges, one range after the other
+    """
+    sizes = ends - starts
+    offsets = np.cumsum(sizes) - sizes
+
+    return np.arange(sizes.sum()) + np.repeat(starts - offsets, sizes)
+
+
+class BoundingVolumeHierarchy:
+    """
+    Tree of axis aligned boxes used to find the objects inside the window
+
+    Each node covers a contiguous range of the objects order, so a node that is
+    fully inside the window accepts all objects below it without going further
+    """
+    LEAF_SIZE = 4
+    """Maximum amount of objects in a leaf"""
+
+    def __init__(self) -> None:
+        """
+        Creates an empty hierarchy
+        """
+        self._boxes: NDArray[np.float64] = np.empty((0, 2, 3))
+        """Box of each object"""
+        self._order: NDArray[np.int64] = np.empty(0, dtype=np.int64)
+        """Objects sorted so each node covers a contiguous range"""
+        self._leaf_of: NDArray[np.int64] = np.empty(0, dtype=np.int64)
+        """Leaf node that holds each object"""
+        self._node_boxes: NDArray[np.float64] = np.empty((0, 2, 3))
+        self._node_ranges: NDArray[np.int64] = np.empty((0, 2), dtype=np.int64)
+        """Start and end of each node in the objects order"""
+        self._children: NDArray[np.int64] = np.empty((0, 2), dtype=np.int64)
+        """Left and right child of each node, -1 on leaves"""
+        self._parents: NDArray[np.int64] = np.empty(0, dtype=np.int64)
+
+    def build(self, boxes: NDArray[np.float64]) -> None:
+        """
+        Rebuilds the whole tree splitting the objects at the median of the longest axis
+
+        @param boxes: Box of each object with shape (objects, 2, 3)
+        """
+        self._boxes = np.array(boxes, dtype=np.float64).reshape(-1, 2, 3)
+        self._order = np.arange(len(self._boxes))
+        self._leaf_of = np.zeros(len(self._boxes), dtype=np.int64)
+        centers = self._boxes.mean(axis=1)
+        node_boxes: list[NDArray[np.float64]] = []
+        node_ranges: list[tuple[int, int]] = []
+        children: list[list[int]] = []
+        parents: list[int] = []
+        # (start, end, parent, side)
+        pending = [(0, len(self._boxes), -1, 0)] if len(self._boxes) > 0 else []
+
+        while pending:
+            start, end, parent, side = pending.pop()
+            node = len(node_ranges)
+            objects = self._order[start:end]
+            node_boxes.append(np.array([
+                self._boxes[objects, 0].min(axis=0),
+                self._boxes[objects, 1].max(axis=0),
+            ]))
+            node_ranges.append((start, end))
+            children.append([-1, -1])
+            parents.append(parent)
+
+            if parent >= 0:
+                children[parent][side] = node
+
+            if end - start <= self.LEAF_SIZE:
+                self._leaf_of[objects] = node
+                continue
+
+            axis = np.argmax(np.ptp(centers[objects], axis=0))
+            middle = (end - start) // 2
+            split = np.argpartition(centers[objects, axis], middle)
+            self._order[start:end] = objects[split]
+            pending.append((start + middle, end, node, 1))
+            pending.append((start, start + middle, node, 0))
+
+        self._node_boxes = np.array(node_boxes).reshape(-1, 2, 3)
+        self._node_ranges = np.array(node_ranges, dtype=np.int64).reshape(-1, 2)
+        self._children = np.array(children, dtype=np.int64).reshape(-1, 2)
+        self._parents = np.array(parents, dtype=np.int64)
+
+    def refit(self, index: int, box: BoundingBox) -> None:
+        """
+        Updates the box of an object and of every node above it
+
+        @param index: Index of the object
+        @param box: New box of the object
+        """
+        self._boxes[index] = box
+        node = self._leaf_of[index]
+
+        while node >= 0:
+            left, right = self._children[node]
+
+            if left < 0:
+                start, end = self._node_ranges[node]
+                boxes = self._boxes[self._order[start:end]]
+            else:
+                boxes = self._node_boxes[[left, right]]
+
+            self._node_boxes[node, 0] = boxes[:, 0].min(axis=0)
+            self._node_boxes[node, 1] = boxes[:, 1].max(axis=0)
+            node = self._parents[node]
+
+    def query(
+        self,
+        matrix: NDArray[np.float64],
+    ) -> tuple[NDArray[np.int64], NDArray[np.bool_]]:
+        """
+        Finds the objects that may be visible through the window
+
+        The tree is walked one level at a time, testing all nodes of a level together
+
+        @param matrix: Matrix that transforms global coordinates into SCN coordinates
+
+        @returns: Sorted indices of the objects whose box reaches the window
+        and a mask of the ones whose box is fully inside it
+        """
+        if len(self._node_boxes) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.bool_)
+
+        visible: list[NDArray[np.int64]] = []
+        visible_inside: list[NDArray[np.bool_]] = []
+        nodes = np.zeros(1, dtype=np.int64)
+
+        while len(nodes) > 0:
+            outside, inside = self.classify(self._node_boxes[nodes], matrix)
+            accepted = nodes[inside]
+            objects = self._order[ranges_to_indices(
+                self._node_ranges[accepted, 0],
+                self._node_ranges[accepted, 1],
+            )]
+            visible.append(objects)
+            visible_inside.append(np.ones(len(objects), dtype=np.bool_))
+
+            nodes = nodes[~outside & ~inside]
+            leaves = nodes[self._children[nodes, 0] < 0]
+            objects = self._order[ranges_to_indices(
+                self._node_ranges[leaves, 0],
+                self._node_ranges[leaves, 1],
+            )]
+            outside, inside = self.classify(self._boxes[objects], matrix)
+            visible.append(objects[~outside])
+            visible_inside.append(inside[~outside])
+            nodes = self._children[nodes[self._children[nodes, 0] >= 0]].ravel()
+
+        indices = np.concatenate(visible)
+        order = np.argsort(indices)
+
+        return indices[order], np.concatenate(visible_inside)[order]
+
+    @staticmethod
+    def classify(
+        boxes: NDArray[np.float64],
+        matrix: NDArray[np.float64],
+    ) -> tuple[NDArray[np.bool_], NDArray[np.bool_]]:
+        """
+        Tests boxes against the window by projecting their corners
+
+        @note Boxes crossing the plane where W is zero can't be bounded by
+              their projected corners, so they are never outside nor inside
+
+        @param boxes: Boxes with shape (boxes, 2, 3)
+        @param matrix: Matrix that transforms global coordinates into SCN coordinates
+
+        @returns: Masks of the boxes fully outside and fully inside the window
+        """
+        corners = np.ones((len(boxes), 8, 4))
+        corners[:, :, :3] = boxes[:, _CORNERS, np.arange(3)]
+        projected = corners @ matrix
+        w = projected[:, :, 3]
+        same_side = (w > 0).all(axis=1) | (w < 0).all(axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            normalised = projected[:, :, :2] / w[:, :, None]
+
+        low = normalised.min(axis=1)
+        high = normalised.max(axis=1)
+        outside = same_side & ((high < -1) | (low > 1)).any(axis=1)
+        inside = same_side & ((low >= -1) & (high <= 1)).all(axis=1)
+
+        return outside, inside
@@ -1,14 +1,110 @@
+from functools import partial
+
 import numpy as np
 from numpy.typing import NDArray
 
-from objects.clipping import ClippingAlgo
-from objects.geometricObject import Colour, GeometricObject, VerticesList
+from objects.bezier_curve import subdivision_depth
+from objects.geometricObject import (
+    Colour,
+    GeometricObject,
+    Subdivision,
+    Tessellator,
+    VerticesList,
+)
+
+MBS: NDArray[np.float64] = np.array([
+    [-1 / 6, 1 / 2, -1 / 2, 1 / 6],
+    [1 / 2, -1, 1 / 2, 0],
+    [-1 / 2, 0, 1 / 2, 0],
+    [1 / 6, 2 / 3, 1 / 6, 0],
+])
+"""B-Spline basis matrix"""
+BSPLINE_TO_BEZIER: NDArray[np.float64] = np.array([
+    [1 / 6, 2 / 3, 1 / 6, 0],
+    [0, 2 / 3, 1 / 3, 0],
+    [0, 1 / 3, 2 / 3, 0],
+    [0, 1 / 6, 2 / 3, 1 / 6],
+])
+"""Turns the 4 control points of a B-Spline span into the ones of the same Bezier"""
+
+
+def e_array(d: float) -> NDArray[np.float64]:
+    return np.array([
+        [0, 0, 0, 1],
+        [d ** 3, d ** 2, d, 0],
+        [6 * d ** 3, 2 * d ** 2, 0, 0],
+        [6 * d ** 3, 0, 0, 0],
+    ])
+
+
+def forward_differences(table: NDArray[np.float64], n: int) -> NDArray[np.float64]:
+    """
+    Steps the forward differences of many curves at once
+
+    @note Cumulative sums add one value at a time in the same order as
+          stepping the differences in a loop, so no rounding changes
+
+    @param table: Initial value and its 3 differences, shape (..., 4, coordinates)
+    @param n: Amount of steps
+
+    @returns: Points of shape (..., n + 1, coordinates), the initial one included
+    """
+    steps = table.shape[:-2] + (n - 1, table.shape[-1])
+    d3 = np.broadcast_to(table[..., 3:, :], steps)
+    d2 = np.concatenate((table[..., 2:3, :], d3), axis=-2).cumsum(axis=-2)
+    d1 = np.concatenate((table[..., 1:2, :], d2[..., :-1, :]), axis=-2).cumsum(axis=-2)
+
+    return np.concatenate((table[..., :1, :], d1), axis=-2).cumsum(axis=-2)
+
+
+def span_indices(control_points: int) -> NDArray[np.int64]:
+    """
+    Returns the indices of the control points of each span of a B-Spline curve
+
+    @param control_points: Amount of control points, at least 4
+
+    @returns: Indices of shape (spans, 4)
+    """
+    # each span uses 4 consecutive control points
+    return np.arange(control_points - 3)[:, None] + np.arange(4)
+
+
+def tessellate_bspline_curve(
+    control_points: NDArray[np.float64],
+    depth: int,
+    visible: NDArray[np.bool_],
+) -> NDArray[np.float64]:
+    """
+    Builds the polylines of a B-Spline curve with forward differences, one per span
+
+    @note All spans are evaluated together
+
+    @param control_points: Control points, at least 4
+    @param depth: Each span is split in 2 ** depth lines
+    @param visible: Mask of the spans to build
+
+    @returns: Polylines of shape (spans, 2 ** depth + 1, 4)
+    after the homogeneous divide
+    """
+    n = 2 ** depth
+    # one column per coordinate
+    spans = span_indices(len(control_points))[visible]
+    columns = control_points[spans].transpose(0, 2, 1)
+    # matrix by column products round like the previous per coordinate code
+    table = (e_array(1 / n) @ (MBS @ columns[..., None]))[..., 0].transpose(0, 2, 1)
+    points = forward_differences(table, n)
+
+    return points / points[:, :, -1:]
 
 
 class BSplineCurve(GeometricObject):
     """
     A B-Spline Curve consists of multiple points identifying the Pi points in the curve
     """
+    POLYLINES = True
+    MAX_DEPTH = 7
+    """Each span is split in at most 2 ** MAX_DEPTH lines"""
+
     def __init__(
         self,
         name: str,
@@ -20,10 +116,6 @@ class BSplineCurve(GeometricObject):
                 "B-Spline curves requires a minimum of 4 points",
             )
 
-        d = 0.01
-        self._n = int(1 / d)
-        self._e = self._e_array(d)
-
         super(BSplineCurve, self).__init__(
             name,
             "BSplineCurve",
@@ -32,113 +124,18 @@ class BSplineCurve(GeometricObject):
             [curve_points],
         )
 
-    @staticmethod
-    def _e_array(d: float) -> NDArray[np.float64]:
-        return np.array([
-            [0, 0, 0, 1],
-            [d ** 3, d ** 2, d, 0],
-            [6 * d ** 3, 2 * d ** 2, 0, 0],
-            [6 * d ** 3, 0, 0, 0],
-        ])
-
-    @staticmethod
-    def _fwd_diff_draw(
-        n: int,
-        lines: list[NDArray[np.float64]],
-        x: float,
-        dx: float,
-        d2x: float,
-        d3x: float,
-        y: float,
-        dy: float,
-        d2y: float,
-        d3y: float,
-        z: float,
-        dz: float,
-        d2z: float,
-        d3z: float,
-        w: float,
-        dw: float,
-        d2w: float,
-        d3w: float,
-    ) -> None:
-        i = 0
-        x_old = x
-        y_old = y
-        z_old = z
-        w_old = w
-
-        while i < n:
-            i += 1
-            x = x + dx
-            dx = dx + d2x
-            d2x = d2x + d3x
-            y = y + dy
-            dy = dy + d2y
-            d2y = d2y + d3y
-            z = z + dz
-            dz = dz + d2z
-            d2z = d2z + d3z
-            w = w + dw
-            dw = dw + d2w
-            d2w = d2w + d3w
-            lines.append(np.array([(x_old, y_old, z_old, w_old), (x, y, z, w)]))
-            x_old = x
-            y_old = y
-            z_old = z
-            w_old = w
-
-    def set_window_coordinates(
-        self,
-        win_coords_matrix: NDArray[np.float64],
-        line_clip: ClippingAlgo,
-    ) -> None:
-        win_spline = [coords @ win_coords_matrix for coords in self._coordinates[0]]
-        self._window_coordinates = []
-        lines: list[NDArray[np.float64]] = []
-
-        for i in range(4, len(win_spline) + 1):
-            p1, p2, p3, p4 = win_spline[i - 4:i]
-            gx: NDArray[np.float64] = np.array([p1[0], p2[0], p3[0], p4[0]])
-            gy: NDArray[np.float64] = np.array([p1[1], p2[1], p3[1], p4[1]])
-            gz: NDArray[np.float64] = np.array([p1[2], p2[2], p3[2], p4[2]])
-            gw: NDArray[np.float64] = np.array([p1[3], p2[3], p3[3], p4[3]])
-            mbs: NDArray[np.float64] = np.array([
-                [-1 / 6, 1 / 2, -1 / 2, 1 / 6],
-                [1 / 2, -1, 1 / 2, 0],
-                [-1 / 2, 0, 1 / 2, 0],
-                [1 / 6, 2 / 3, 1 / 6, 0],
-            ])
-            cx: NDArray[np.float64] = mbs @ gx
-            cy: NDArray[np.float64] = mbs @ gy
-            cz: NDArray[np.float64] = mbs @ gz
-            cw: NDArray[np.float64] = mbs @ gw
-            x: NDArray[np.float64] = self._e @ cx
-            y: NDArray[np.float64] = self._e @ cy
-            z: NDArray[np.float64] = self._e @ cz
-            w: NDArray[np.float64] = self._e @ cw
-            self._fwd_diff_draw(
-                self._n, lines,
-                x[0], x[1], x[2], x[3],
-                y[0], y[1], y[2], y[3],
-                z[0], z[1], z[2], z[3],
-                w[0], w[1], w[2], w[3],
-            )
+    def get_tessellator(self, subdivision: Subdivision) -> Tessellator:
+        depth, visible = subdivision
 
-        np_lines = np.array(lines)
-        np_lines = np_lines / np_lines[:, :, -1:]
+        return partial(tessellate_bspline_curve, depth=depth, visible=visible)
 
-        for win_coords in np_lines:
-            obj = None
+    def get_subdivision(self, win_coords_matrix: NDArray[np.float64]) -> Subdivision:
+        projected = self._vertices @ win_coords_matrix
+        # the same spans as Bezier segments, whose hull is tighter
+        spans = BSPLINE_TO_BEZIER @ projected[span_indices(len(projected))]
+        visible = ~self.hull_outside_mask(spans)
 
-            if line_clip == ClippingAlgo.Points:
-                obj = self.clip_by_point(win_coords)
-            elif line_clip == ClippingAlgo.CohenSutherland:
-                obj = self.clip_cohen_sutherland(win_coords)
-            elif line_clip == ClippingAlgo.LiangBarsky:
-                obj = self.clip_liang_barsky(win_coords)
-            elif line_clip == ClippingAlgo.NichollLeeNicholl:
-                obj = self.clip_nicholl_lee_nicholl(win_coords)
-
-            if obj is not None:
-                self._window_coordinates.append(obj)
+        return (
+            subdivision_depth(spans[visible], self._tolerance, self.MAX_DEPTH),
+            visible,
+        )
@@ -1,15 +1,78 @@
+from functools import partial
+
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from numpy.typing import NDArray
 
-from objects.bspline_curve import BSplineCurve
-from objects.clipping import ClippingAlgo
-from objects.geometricObject import Colour
+from objects.bezier_curve import subdivision_depth
+from objects.bspline_curve import (
+    BSPLINE_TO_BEZIER,
+    BSplineCurve,
+    MBS,
+    e_array,
+    forward_differences,
+)
+from objects.geometricObject import Colour, Subdivision, Tessellator
+
+
+def bspline_patches(grid: NDArray[np.float64]) -> NDArray[np.float64]:
+    """
+    Splits a grid of control points into the 4x4 points of each patch
+
+    @param grid: Control points of shape (u, v, coordinates)
+
+    @returns: Patches of shape (patches, coordinates, 4, 4), ordered along u first
+    """
+    # every 4x4 window of the grid is a patch
+    return sliding_window_view(
+        grid,
+        (4, 4),
+        axis=(0, 1),
+    ).transpose(1, 0, 2, 3, 4).reshape(-1, grid.shape[2], 4, 4)
+
+
+def tessellate_bspline_surface(
+    control_points: NDArray[np.float64],
+    shape: tuple[int, ...],
+    depth: int,
+    visible: NDArray[np.bool_],
+) -> NDArray[np.float64]:
+    """
+    Builds the polylines of a B-Spline surface with forward differences
+
+    @note All patches are evaluated together, first stepping the differences
+          across the curves of each direction and then along each curve
+
+    @param control_points: Control points
+    @param shape: Shape of the control points grid, (u, v, 4)
+    @param depth: Each patch has 2 ** depth + 1 curves per direction,
+    split in 2 ** depth lines
+    @param visible: Mask of the patches to build
+
+    @returns: Polylines of shape (curves, 2 ** depth + 1, 4)
+    after the homogeneous divide
+    """
+    n = 2 ** depth
+    e = e_array(1 / n)
+    patches = bspline_patches(control_points.reshape(shape))[visible]
+    # difference tables of each patch and coordinate, rows along s and columns along t
+    tables = e @ (MBS @ patches @ MBS.T) @ e.T
+    # the curves along t, then the curves along s
+    tables = np.stack((tables, tables.swapaxes(-1, -2)), axis=1)
+    # the tables of the curves, with the coordinates back on the last axis
+    curves = np.moveaxis(forward_differences(tables, n), 2, -1)
+    points = forward_differences(curves, n).reshape(-1, n + 1, 4)
+
+    return points / points[..., -1:]
 
 
 class BSplineSurface(BSplineCurve):
     """
     A B-Spline Surface consists of multiple B-Spline curves at minimum 4x4
     """
+    MAX_DEPTH = 5
+    """Each patch is split in at most 2 ** MAX_DEPTH lines per direction"""
+
     def __init__(
         self,
         name: str,
@@ -26,107 +89,47 @@ class BSplineSurface(BSplineCurve):
                 "B-Spline surfaces requires at minimum a 4x4 matrix of points",
             )
 
-        self._points = surface_points
-        d = 0.05
-        self._n = int(1 / d)
-        self._e = self._e_array(d)
-        self._mbs: NDArray[np.float64] = np.array([
-            [-1 / 6, 1 / 2, -1 / 2, 1 / 6],
-            [1 / 2, -1, 1 / 2, 0],
-            [-1 / 2, 0, 1 / 2, 0],
-            [1 / 6, 2 / 3, 1 / 6, 0],
-        ])
+        self._shape = surface_points.shape
+
+        control_points = list(surface_points.reshape(
+            (surface_points.shape[0] * surface_points.shape[1], 4),
+        ))
 
         super(BSplineCurve, self).__init__(
             name,
             "BSplineSurface",
             colour,
-            list(self._points.reshape(
-                (surface_points.shape[0] * surface_points.shape[1], 4),
-            )),
-            [],
+            control_points,
+            [tuple(control_points)],
         )
 
-    def _build_curves(
-        self,
-        lines: list[NDArray[np.float64]],
-        ddx: NDArray[np.float64],
-        ddy: NDArray[np.float64],
-        ddz: NDArray[np.float64],
-        ddw: NDArray[np.float64],
-    ) -> None:
-        for _ in range(self._n + 1):
-            self._fwd_diff_draw(
-                self._n, lines,
-                ddx[0][0], ddx[0][1], ddx[0][2], ddx[0][3],
-                ddy[0][0], ddy[0][1], ddy[0][2], ddy[0][3],
-                ddz[0][0], ddz[0][1], ddz[0][2], ddz[0][3],
-                ddw[0][0], ddw[0][1], ddw[0][2], ddw[0][3],
-            )
-            ddx[0:3] = ddx[0:3] + ddx[1:4]
-            ddy[0:3] = ddy[0:3] + ddy[1:4]
-            ddz[0:3] = ddz[0:3] + ddz[1:4]
-            ddw[0:3] = ddw[0:3] + ddw[1:4]
+    def get_tessellator(self, subdivision: Subdivision) -> Tessellator:
+        depth, visible = subdivision
 
-    def set_window_coordinates(
-        self,
-        win_coords_matrix: NDArray[np.float64],
-        line_clip: ClippingAlgo,
-    ) -> None:
-        win_spline = self._points @ win_coords_matrix
-        self._window_coordinates = []
-        lines: list[NDArray[np.float64]] = []
-
-        for j in range(4, win_spline.shape[1] + 1):
-            for i in range(4, win_spline.shape[0] + 1):
-                cx: NDArray[np.float64] = self._mbs @ win_spline[
-                    i - 4:i,
-                    j - 4:j,
-                    0,
-                ] @ self._mbs.T
-                cy: NDArray[np.float64] = self._mbs @ win_spline[
-                    i - 4:i,
-                    j - 4:j,
-                    1,
-                ] @ self._mbs.T
-                cz: NDArray[np.float64] = self._mbs @ win_spline[
-                    i - 4:i,
-                    j - 4:j,
-                    2,
-                ] @ self._mbs.T
-                cw: NDArray[np.float64] = self._mbs @ win_spline[
-                    i - 4:i,
-                    j - 4:j,
-                    3,
-                ] @ self._mbs.T
-                ddtx: NDArray[np.float64] = self._e @ cx @ self._e.T
-                ddty: NDArray[np.float64] = self._e @ cy @ self._e.T
-                ddtz: NDArray[np.float64] = self._e @ cz @ self._e.T
-                ddtw: NDArray[np.float64] = self._e @ cw @ self._e.T
-                ddsx = np.copy(ddtx.T)
-                ddsy = np.copy(ddty.T)
-                ddsz = np.copy(ddtz.T)
-                ddsw = np.copy(ddtw.T)
-                self._build_curves(lines, ddtx, ddty, ddtz, ddtw)
-                self._build_curves(lines, ddsx, ddsy, ddsz, ddsw)
-
-        np_lines = np.array(lines)
-        np_lines = np_lines / np_lines[:, :, -1:]
-
-        for win_coords in np_lines:
-            obj = None
-
-            if line_clip == ClippingAlgo.Points:
-                obj = self.clip_by_point(win_coords)
-            elif line_clip == ClippingAlgo.CohenSutherland:
-                obj = self.clip_cohen_sutherland(win_coords)
-            elif line_clip == ClippingAlgo.LiangBarsky:
-                obj = self.clip_liang_barsky(win_coords)
-            elif line_clip == ClippingAlgo.NichollLeeNicholl:
-                obj = self.clip_nicholl_lee_nicholl(win_coords)
-
-            if obj is not None:
-                self._window_coordinates.append(obj)
+        return partial(
+            tessellate_bspline_surface,
+            shape=self._shape,
+            depth=depth,
+            visible=visible,
+        )
+
+    def get_subdivision(self, win_coords_matrix: NDArray[np.float64]) -> Subdivision:
+        projected = self._vertices @ win_coords_matrix
+        patches = bspline_patches(projected.reshape(self._shape))
+        # the same patches as Bezier patches, with the coordinates on the last axis
+        patches = np.moveaxis(BSPLINE_TO_BEZIER @ patches @ BSPLINE_TO_BEZIER.T, 1, -1)
+        visible = ~self.hull_outside_mask(patches.reshape(-1, 16, 4))
+        patches = patches[visible]
+
+        # the curves along t of each patch, then the curves along s
+        return (
+            subdivision_depth(
+                np.concatenate((patches, patches.swapaxes(1, 2))),
+                self._tolerance,
+                self.MAX_DEPTH,
+            ),
+            visible,
+        )
 
     def get_coordinates(self) -> list[NDArray[np.float64]]:
         """
@@ -134,19 +137,4 @@ class BSplineSurface(BSplineCurve):
 
         @returns: Tuple of global coordinates for each point
         """
-        return [self._points]
-
-    def transform(
-        self,
-        transform_matrix: NDArray[np.float64],
-        window_matrix: NDArray[np.float64],
-        line_clip: ClippingAlgo,
-    ) -> None:
-        """
-        Transform the object throught a tranformation matrix
-
-        @param transform_matrix: Transformation Matrix to apply on the obejct
-        """
-        self._points = self._points @ transform_matrix
-        self._center = self._center @ transform_matrix
-        self.set_window_coordinates(window_matrix, line_clip)
+        return [self._vertices.reshape(self._shape)]
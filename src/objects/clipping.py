@@ -17,6 +17,45 @@ class ClippingAlgo(Enum):
 
 class Clipping:
     """Clipping algorithms"""
+    @staticmethod
+    def clip_by_point_mask(vertices: NDArray[np.float64]) -> NDArray[np.bool_]:
+        """
+        Basic point clipping for many vertices at once
+
+        @param vertices: Array of vertices with shape (..., 4)
+
+        @returns: Mask of the vertices inside the window, in the same shape
+        """
+        x = vertices[..., 0]
+        y = vertices[..., 1]
+
+        return ~((x > 1) | (x < -1) | (y > 1) | (y < -1))
+
+    @staticmethod
+    def hull_outside_mask(control_points: NDArray[np.float64]) -> NDArray[np.bool_]:
+        """
+        Tests groups of projected points against the window, before the homogeneous
+        divide, to know which curve segments or patches can't reach it
+
+        @note Curves lie inside the convex hull of their control points,
+              so a group fully beyond one side of the window is fully outside
+
+        @note Groups crossing the plane where W is zero are never outside
+
+        @param control_points: Projected points with shape (..., points, 4)
+
+        @returns: Mask of the groups fully outside the window, shape (...)
+        """
+        w = control_points[..., 3]
+        same_side = (w > 0).all(axis=-1) | (w < 0).all(axis=-1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            normalised = control_points[..., :2] / w[..., None]
+
+        beyond = (normalised > 1).all(axis=-2) | (normalised < -1).all(axis=-2)
+
+        return np.asarray(same_side & beyond.any(axis=-1))
+
     @staticmethod
     def clip_by_point(points: NDArray[np.float64]) -> OptionalObject:
         """
@@ -28,22 +67,10 @@ class Clipping:
 
         @returns: Vertices that are visible or None if nothing is visible
         """
-        vertex: NDArray[np.float64]
-        v_x: np.float64
-        v_y: np.float64
-
-        clipped_coords: list[NDArray[np.float64]] = []
-
-        for vertex in points:
-            (v_x, v_y, _, _) = vertex
+        visible = Clipping.clip_by_point_mask(points)
 
-            if v_x > 1 or v_x < -1 or v_y > 1 or v_y < -1:
-                continue
-
-            clipped_coords.append(vertex)
-
-        if len(clipped_coords) > 0:
-            return np.array(clipped_coords)
+        if visible.any():
+            return points[visible]
 
         return None
 
@@ -111,7 +138,7 @@ class Clipping:
                     x = -1 + (rc[idx] & 2)
                     y = m * (x - x0) + y0
 
-                    if y >= -1 or y <= 1:
+                    if y >= -1 and y <= 1:
                         new_edge[idx][0] = x
                         new_edge[idx][1] = y
                         continue
@@ -122,6 +149,85 @@ class Clipping:
         else:  # fully inside
             return edge
 
+    @staticmethod
+    def region_codes(vertices: NDArray[np.float64]) -> NDArray[np.uint8]:
+        """
+        Cohen-Sutherland region codes of many vertices at once
+
+        @param vertices: Array of vertices with shape (..., 4)
+
+        @returns: Codes with the bits Top Bottom Right Left, in the same shape
+        """
+        x = vertices[..., 0]
+        y = vertices[..., 1]
+
+        return (
+            (y > 1).astype(np.uint8) << np.uint8(3)
+            | (y < -1).astype(np.uint8) << np.uint8(2)
+            | (x > 1).astype(np.uint8) << np.uint8(1)
+            | (x < -1).astype(np.uint8)
+        )
+
+    @classmethod
+    def clip_cohen_sutherland_batch(
+        cls,
+        edges: NDArray[np.float64],
+    ) -> tuple[NDArray[np.float64], NDArray[np.bool_]]:
+        """
+        Line clipping with Cohen-Sutherland algorithm for many edges at once
+
+        Edges are accepted and rejected in bulk by their region codes,
+        only the partially visible ones go through the intersection step
+
+        @param edges: Array of edges with shape (edges, 2, 4)
+
+        @returns: Clipped edges with the same shape and a mask of the visible ones
+        """
+        rc = cls.region_codes(edges)
+        visible = (rc[:, 0] & rc[:, 1]) == 0
+        clipped = edges.copy()
+        partial = np.flatnonzero(visible & ((rc[:, 0] | rc[:, 1]) != 0))
+
+        if len(partial) == 0:
+            return clipped, visible
+
+        x0 = edges[partial, 0, 0]
+        y0 = edges[partial, 0, 1]
+        dx = edges[partial, 1, 0] - x0
+        dy = edges[partial, 1, 1] - y0
+        rejected = np.zeros(len(partial), dtype=np.bool_)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            m = np.where(dx != 0, dy / dx, 0)
+
+            for idx in range(0, 2):
+                code = rc[partial, idx]
+                done = code == 0
+
+                # Top or Bottom
+                y = np.where(code & 8, 1., -1.)
+                # m would be infinite, but we define as 0
+                # if m = inifinity => x = x0
+                x = np.where(m != 0, x0 + (y - y0) / m, x0)
+                inside = ~done & (code > 3) & (x >= -1) & (x <= 1)
+                clipped[partial[inside], idx, 0] = x[inside]
+                clipped[partial[inside], idx, 1] = y[inside]
+                done |= inside
+
+                # Left or Right
+                x = np.where(code & 2, 1., -1.)
+                y = m * (x - x0) + y0
+                inside = ~done & ((code & 3) != 0) & (y >= -1) & (y <= 1)
+                clipped[partial[inside], idx, 0] = x[inside]
+                clipped[partial[inside], idx, 1] = y[inside]
+                done |= inside
+
+                rejected |= ~done
+
+        visible[partial[rejected]] = False
+
+        return clipped, visible
+
     @staticmethod
     def clip_liang_barsky(edge: NDArray[np.float64]) -> OptionalObject:
         """
@@ -181,6 +287,47 @@ class Clipping:
 
         return None
 
+    @staticmethod
+    def clip_liang_barsky_batch(
+        edges: NDArray[np.float64],
+    ) -> tuple[NDArray[np.float64], NDArray[np.bool_]]:
+        """
+        Line clipping with Liang-Barsky algorithm for many edges at once
+
+        Same as `clip_liang_barsky` but every step is done on whole arrays
+
+        @param edges: Array of edges with shape (edges, 2, 4)
+
+        @returns: Clipped edges with the same shape and a mask of the visible ones
+        """
+        x0 = edges[:, 0, 0]
+        y0 = edges[:, 0, 1]
+        dx = edges[:, 1, 0] - x0
+        dy = edges[:, 1, 1] - y0
+        p = np.stack((-dx, dx, -dy, dy), axis=1)
+        q = np.stack((x0 + 1, 1 - x0, y0 + 1, 1 - y0), axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = np.where(p != 0, q / p, 0)
+
+        zeta1 = np.where(p < 0, r, 0).max(axis=1)
+        zeta2 = np.where(p > 0, r, 1).min(axis=1)
+        visible = (
+            ~((dx == 0) & ((q[:, 0] < 0) | (q[:, 1] < 0)))
+            & ~((dy == 0) & ((q[:, 2] < 0) | (q[:, 3] < 0)))
+            & (zeta1 <= zeta2)
+        )
+
+        clipped = edges.copy()
+        start = visible & (zeta1 > 0)
+        clipped[start, 0, 0] = x0[start] + zeta1[start] * dx[start]
+        clipped[start, 0, 1] = y0[start] + zeta1[start] * dy[start]
+        end = visible & (zeta2 < 1)
+        clipped[end, 1, 0] = x0[end] + zeta2[end] * dx[end]
+        clipped[end, 1, 1] = y0[end] + zeta2[end] * dy[end]
+
+        return clipped, visible
+
     @staticmethod
     def clip_nicholl_lee_nicholl(edge: NDArray[np.float64]) -> OptionalObject:
         """
@@ -208,96 +355,184 @@ class Clipping:
 
         return np.array(clipped_coords)
 
+    @classmethod
+    def clip_edges(
+        cls,
+        edges: NDArray[np.float64],
+        line_clip: ClippingAlgo,
+    ) -> list[NDArray[np.float64]]:
+        """
+        Line clipping of many edges with the chosen algorithm
+
+        @param edges: Array of edges with shape (edges, 2, 4)
+        @param line_clip: Clipping algorithm to use
+
+        @returns: The visible part of each edge, invisible edges are dropped
+        """
+        if line_clip == ClippingAlgo.LiangBarsky:
+            clipped, visible = cls.clip_liang_barsky_batch(edges)
+            return list(clipped[visible])
+
+        if line_clip == ClippingAlgo.CohenSutherland:
+            clipped, visible = cls.clip_cohen_sutherland_batch(edges)
+            return list(clipped[visible])
+
+        if line_clip == ClippingAlgo.Points:
+            # edges become the vertices that are left of them
+            visible = cls.clip_by_point_mask(edges)
+            whole = visible.all(axis=1)
+            single = visible[:, 0] != visible[:, 1]
+            return list(edges[whole]) + list(edges[single][visible[single]][:, None])
+
+        return [
+            obj for obj in map(cls.clip_nicholl_lee_nicholl, edges) if obj is not None
+        ]
+
+    @classmethod
+    def clip_polylines(
+        cls,
+        vertices: NDArray[np.float64],
+        offsets: NDArray[np.int64],
+        line_clip: ClippingAlgo,
+    ) -> list[NDArray[np.float64]]:
+        """
+        Line clipping of many polylines with the chosen algorithm
+
+        Every edge of every polyline is clipped at once, then the polylines are
+        split into runs of visible edges, a run ends where an edge is invisible
+        or was cut by the window
+
+        @param vertices: Vertices of all polylines with shape (vertices, 4)
+        @param offsets: Where each polyline starts in the vertices array,
+        plus the end of the last one
+        @param line_clip: Clipping algorithm to use
+
+        @returns: The visible runs of the polylines, with at least 2 vertices,
+        or single vertices when clipping by points
+        """
+        if line_clip == ClippingAlgo.Points:
+            # runs of consecutive vertices inside the window
+            visible = cls.clip_by_point_mask(vertices)
+            breaks = np.flatnonzero(np.diff(visible.astype(np.int8)) != 0) + 1
+            breaks = np.union1d(breaks, offsets[1:-1])
+            return [
+                vertices[start:end]
+                for start, end in zip(
+                    np.concatenate(([0], breaks)),
+                    np.concatenate((breaks, [len(vertices)])),
+                )
+                if end > start and visible[start]
+            ]
+
+        # the edges between consecutive vertices of the same polyline
+        has_edge = np.ones(len(vertices), dtype=np.bool_)
+        has_edge[offsets[1:] - 1] = False
+        starts = np.flatnonzero(has_edge)
+        edges = vertices[starts[:, None] + np.arange(2)]
+
+        if line_clip == ClippingAlgo.LiangBarsky:
+            clipped, visible = cls.clip_liang_barsky_batch(edges)
+        elif line_clip == ClippingAlgo.CohenSutherland:
+            clipped, visible = cls.clip_cohen_sutherland_batch(edges)
+        else:
+            results = list(map(cls.clip_nicholl_lee_nicholl, edges))
+            visible = np.array([obj is not None for obj in results], dtype=np.bool_)
+            clipped = edges.copy()
+            clipped[visible] = [
+                np.reshape(obj, (2, 4)) for obj in results if obj is not None
+            ]
+
+        cut = (clipped != edges).any(axis=2)
+        # a run starts on the first edge of a polyline or after a broken joint
+        new_run = np.ones(len(edges), dtype=np.bool_)
+        new_run[1:] = ~visible[:-1] | cut[:-1, 1] | cut[1:, 0]
+        new_run[np.isin(starts, offsets[:-1])] = True
+        kept = np.flatnonzero(visible)
+
+        if len(kept) == 0:
+            return []
+
+        run_starts = np.flatnonzero(new_run[kept])
+        run_ends = np.append(run_starts[1:], len(kept))
+        # the first vertex of each edge, plus the last vertex of each run
+        runs = np.insert(
+            clipped[kept, 0],
+            run_ends,
+            clipped[kept[run_ends - 1], 1],
+            axis=0,
+        )
+
+        return np.split(runs, (run_starts + np.arange(len(run_starts)))[1:])
+
     @staticmethod
-    def clip_sutherland_hodgeman(polygon: NDArray[np.float64]) -> OptionalObject:
+    def clip_sutherland_hodgeman_batch(
+        vertices: NDArray[np.float64],
+        offsets: NDArray[np.int64],
+    ) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
         """
-        Polygon clipping with Liang-Barsky algorithm
+        Polygon clipping with Sutherland-Hodgman algorithm for many faces at once
 
-        @param polygon: Polygon (list of vertices) to clip
+        Faces are stored one after the other in a single array and each pass
+        over a window boundary is done on every edge of every face together
 
-        @returns: New clipped polygon or None if outside view
+        @param vertices: Vertices of all faces with shape (vertices, 4)
+        @param offsets: Where each face starts in the vertices array,
+        plus the end of the last one
+
+        @returns: Clipped vertices and offsets in the same layout,
+        faces outside the window are left empty
         """
-        temp = polygon.tolist()
-
-        for j in range(0, 4):
-            cur = temp
-            temp = []
-            test_var = j > 1
-            test_value = 2 * (j % 2) - 1
-
-            for i in range(0, len(cur)):
-                v0 = cur[i % len(cur)]
-                v1 = cur[(i + 1) % len(cur)]
-                m = 0.
-
-                if v1[0] - v0[0] != 0.:
-                    m = (v1[1] - v0[1]) / (v1[0] - v0[0])
-
-                if v0[test_var] < test_value and v1[test_var] < test_value:
-                    if test_value == 1:
-                        temp.append(v0)
-                        temp.append(v1)
-                    continue
+        for axis, bound in ((0, -1), (0, 1), (1, -1), (1, 1)):
+            filled = np.diff(offsets) > 0
+            # index of the next vertex in the same face, the last goes to the first
+            following = np.arange(1, len(vertices) + 1)
+            following[offsets[1:][filled] - 1] = offsets[:-1][filled]
+
+            if bound < 0:
+                inside = vertices[:, axis] >= bound
+            else:
+                inside = vertices[:, axis] <= bound
+
+            # each edge outputs the intersection when crossing the boundary
+            # followed by its end vertex when it is inside
+            inside_next = inside[following]
+            crossing = inside != inside_next
+            edge_offsets = np.concatenate(
+                ([0], np.cumsum(crossing.astype(np.int64) + inside_next)),
+            )
+            clipped = np.empty((edge_offsets[-1], 4))
+
+            current = vertices[crossing]
+            delta = vertices[following[crossing]] - current
+            t = (bound - current[:, axis]) / delta[:, axis]
+            intersection = current + t[:, None] * delta
+            intersection[:, axis] = bound
+            clipped[edge_offsets[:-1][crossing]] = intersection
+            clipped[edge_offsets[1:][inside_next] - 1] = vertices[following[inside_next]]
+
+            vertices = clipped
+            offsets = edge_offsets[offsets]
+
+        return vertices, offsets
 
-                if v0[test_var] > test_value and v1[test_var] > test_value:
-                    if test_value == -1:
-                        temp.append(v0)
-                        temp.append(v1)
-                    continue
+    @classmethod
+    def clip_sutherland_hodgeman(cls, polygon: NDArray[np.float64]) -> OptionalObject:
+        """
+        Polygon clipping with Sutherland-Hodgman algorithm
 
-                if not test_var:
-                    x = test_value
-                    y = m * (x - v0[0]) + v0[1]
-
-                    if (
-                        (test_value == 1 and v0[test_var] < test_value)
-                        or (test_value == -1 and v0[test_var] > test_value)
-                    ):
-                        temp.append(v0)
-                        temp.append([x, y, 1, 1])
-                    else:
-                        temp.append([x, y, 1, 1])
-                        temp.append(v1)
-                else:
-                    y = test_value
+        @param polygon: Polygon (list of vertices) to clip
 
-                    # m would be infinite, but we define as 0
-                    # if m = inifinity => x = x0
-                    x = v0[0]
-                    if m != 0.:
-                        x = v0[0] + (y - v0[1]) / m
-
-                    if (
-                        (test_value == 1 and v0[test_var] < test_value)
-                        or (test_value == -1 and v0[test_var] > test_value)
-                    ):
-                        temp.append(v0)
-                        temp.append([x, y, 1, 1])
-                    else:
-                        temp.append([x, y, 1, 1])
-                        temp.append(v1)
-
-        if len(temp) == 0:
-            max_x = 0
-            min_x = 0
-            max_y = 0
-            min_y = 0
-            for vertex in temp:
-                (x, y, _) = vertex
-                max_x = max(max_x, x)
-                max_y = max(max_y, y)
-                min_x = min(min_x, x)
-                min_y = min(min_y, y)
-            if max_x > 1 and min_x < -1 and max_y > 1 and min_y < -1:
-                return np.array([
-                    [-1, 1, 1, 1],
-                    [1, 1, 1, 1],
-                    [1, -1, 1, 1],
-                    [-1, -1, 1, 1],
-                ])
+        @returns: New clipped polygon or None if outside view
+        """
+        clipped, _ = cls.clip_sutherland_hodgeman_batch(
+            polygon.astype(np.float64),
+            np.array([0, len(polygon)]),
+        )
+
+        if len(clipped) == 0:
             return None
 
-        return np.array(temp)
+        return clipped
 
     @classmethod
     def clip_weiler_atherton(cls, polygon: NDArray[np.float64]) -> OptionalObject:
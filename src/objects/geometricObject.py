@@ -1,8 +1,9 @@
-from typing import Literal
+from typing import Callable, Literal
 
 import numpy as np
 from numpy.typing import NDArray
 
+from objects.bounding_volume_hierarchy import BoundingBox, BoundingVolumeHierarchy
 from objects.clipping import Clipping, ClippingAlgo
 
 Coordinate = tuple[float, float, float]
@@ -21,10 +22,28 @@ List of the basic types (points, edges & faces) as tuples of Normalised Coordina
 """
 Colour = tuple[int, int, int]
 """A RGB colour tuple, each value goes from 0 to 255"""
+TOLERANCE = 0.002
+"""
+Default maximum distance between curves and their lines in window coordinates,
+about half a pixel on a viewport 500 pixels wide
+"""
+Subdivision = tuple[int, NDArray[np.bool_]]
+"""
+Depth, each segment or patch of a curve or surface is split in 2 ** depth lines,
+and mask of the segments or patches that reach the window
+"""
+Tessellator = Callable[[NDArray[np.float64]], NDArray[np.float64]]
+"""
+Pure function that builds polylines of shape (polylines, points, 4) after the
+homogeneous divide from the vertices, it must be picklable to run in other processes
+"""
 
 
 class GeometricObject(Clipping):
     """Geometric Object is the base class for all objects that can be drawn"""
+    POLYLINES = False
+    """Whether primitives of more than 2 vertices are open polylines instead of faces"""
+
     def __init__(
         self,
         name: str,
@@ -46,8 +65,40 @@ class GeometricObject(Clipping):
         self._name = name
         self._type = obj_type
         self._colour = colour
-        self._coordinates: list[NDArray[np.float64]] = [np.array(c) for c in obj_list]
+        # all primitives are packed one after the other in a single array,
+        # the offsets mark where each primitive starts and the last one where it ends
+        self._vertices: NDArray[np.float64] = np.array(
+            [coord for primitive in obj_list for coord in primitive],
+            dtype=np.float64,
+        ).reshape(-1, 4)
+        self._offsets: NDArray[np.int64] = np.cumsum(
+            [0] + [len(primitive) for primitive in obj_list],
+            dtype=np.int64,
+        )
+        self._bounding_box = self._get_vertices_box()
+        self._bounding_sphere = self._get_vertices_sphere()
         self._window_coordinates: list[NDArray[np.float64]] = []
+        self._tessellation: (
+            tuple[Subdivision, NDArray[np.float64], NDArray[np.int64]] | None
+        ) = None
+        """
+        Subdivision, packed polylines of curves and surfaces in global coordinates
+        and their offsets
+        """
+        self._tolerance = TOLERANCE
+        """Maximum distance between curves and their lines in window coordinates"""
+        self._unclipped: NDArray[np.float64] = np.empty((0, 4))
+        """Primitives in window coordinates before clipping, packed"""
+        self._unclipped_offsets: NDArray[np.int64] = np.zeros(1, dtype=np.int64)
+        """Where each unclipped primitive starts, plus the end of the last"""
+        self._pending_window: tuple[NDArray[np.float64], ClippingAlgo] | None = None
+        """Window matrix and clipping waiting to be evaluated, None when up to date"""
+        self._window_change: tuple[float, NDArray[np.float64]] | None = None
+        """
+        Scale and offset from the unclipped coordinates to the pending window,
+        None when they must be projected again
+        """
+        self._transform_listeners: list[Callable[["GeometricObject"], None]] = []
         unique_vertices = np.unique(np.array(vertices), axis=0)
         self._center = unique_vertices.sum(axis=0) / len(unique_vertices)
 
@@ -83,16 +134,93 @@ class GeometricObject(Clipping):
 
         @returns: Tuple of global coordinates for each point
         """
-        return self._coordinates
+        return np.split(self._vertices, self._offsets[1:-1])
+
+    def get_vertices(self) -> NDArray[np.float64]:
+        """
+        Returns the global coordinates of all primitives packed in a single array
+
+        @returns: Array of shape (vertices, 4)
+        """
+        return self._vertices
+
+    def get_primitive_offsets(self) -> NDArray[np.int64]:
+        """
+        Returns where each primitive starts in the packed vertices array
+
+        @note The last value is where the last primitive ends
+
+        @returns: Array with the amount of primitives plus one
+        """
+        return self._offsets
+
+    def get_evaluation_size(self) -> int:
+        """
+        Estimates how many vertices the evaluation of the window coordinates handles
+
+        @note Curves and surfaces count the lines of their last evaluation,
+              before it only their control points are known
+
+        @returns: Amount of vertices
+        """
+        return max(len(self._unclipped), len(self._vertices))
 
     def get_window_coordinates(self) -> list[NDArray[np.float64]]:
         """
         Returns the window coordinates of each point of the object
 
+        @note Coordinates are only evaluated here if the window or the object
+              changed since the last time they were evaluated
+
         @returns: Tuple of window coordinates for each point
         """
+        if self._pending_window is not None and not self.reuse_window_coordinates():
+            self.set_window_coordinates(*self._pending_window)
+
         return self._window_coordinates
 
+    def window_coordinates_outdated(self) -> bool:
+        """
+        Returns whether the window coordinates are waiting to be evaluated
+
+        @returns: True if the window or the object changed since the last evaluation
+        """
+        return self._pending_window is not None
+
+    def invalidate_window_coordinates(
+        self,
+        win_coords_matrix: NDArray[np.float64],
+        line_clip: ClippingAlgo,
+        scale: float | None = None,
+        offset: NDArray[np.float64] | None = None,
+    ) -> None:
+        """
+        Marks the window coordinates as outdated without evaluating them
+
+        @note When a scale or an offset is given the new window coordinates are
+              the previous ones scaled then offset, so they can be clipped again
+              instead of projected and tessellated
+
+        @param win_coords_matrix: Matrix to transform the global coordinates
+        into window coordinates
+        @param line_clip: Clipping algorithm to use on edges
+        @param scale: Factor applied to X and Y of the previous window coordinates
+        @param offset: Amount added to X, Y and Z of the previous window coordinates
+        """
+        self._pending_window = (win_coords_matrix, line_clip)
+
+        if scale is None and offset is None:
+            self._window_change = None
+        elif self._window_change is not None:
+            scale = 1. if scale is None else scale
+            offset = np.zeros(3) if offset is None else offset
+            # many changes before an evaluation are combined into a single one
+            previous_scale, previous_offset = self._window_change
+            self._window_change = (
+                previous_scale * scale,
+                previous_offset * (scale, scale, 1) + offset,
+            )
+
     def get_center(self) -> NDArray[np.float64]:
         """
         Returns the center point of the object
@@ -101,6 +229,90 @@ class GeometricObject(Clipping):
         """
         return self._center
 
+    def get_bounding_box(self) -> BoundingBox:
+        """
+        Returns the axis aligned box around the object
+
+        @returns: Array with the minimum and the maximum coordinates
+        """
+        return self._bounding_box
+
+    def _get_vertices_box(self) -> BoundingBox:
+        """
+        Computes the axis aligned box around the vertices
+
+        @note Curves and surfaces are inside the convex hull of their control points,
+              so the box of the control points also holds them
+
+        @returns: Array with the minimum and the maximum coordinates
+        """
+        return np.array([
+            self._vertices[:, :3].min(axis=0),
+            self._vertices[:, :3].max(axis=0),
+        ])
+
+    def get_bounding_sphere(self) -> tuple[NDArray[np.float64], float]:
+        """
+        Returns the sphere around the object
+
+        @returns: Center coordinates and radius
+        """
+        return self._bounding_sphere
+
+    def _get_vertices_sphere(self) -> tuple[NDArray[np.float64], float]:
+        """
+        Computes a sphere around the vertices centred on their box
+
+        @returns: Center coordinates and radius
+        """
+        center = self._bounding_box.mean(axis=0)
+        radius = np.linalg.norm(self._vertices[:, :3] - center, axis=1).max()
+
+        return center, float(radius)
+
+    def classify_bounds(
+        self,
+        win_coords_matrix: NDArray[np.float64],
+    ) -> tuple[bool, bool]:
+        """
+        Tests the bounding volumes of the object against the window
+
+        The sphere is tested first against the planes of the window,
+        when it can't decide the corners of the box are projected
+
+        @param win_coords_matrix: Matrix to transform the global coordinates
+        into window coordinates
+
+        @returns: Whether the object is fully outside and whether it is fully inside
+        """
+        center, radius = self._bounding_sphere
+        # the window planes in SCN space are W - X, W + X, W - Y, W + Y and W itself
+        m = win_coords_matrix
+        planes = np.stack((
+            m[:, 3] - m[:, 0],
+            m[:, 3] + m[:, 0],
+            m[:, 3] - m[:, 1],
+            m[:, 3] + m[:, 1],
+            m[:, 3],
+        ))
+        distances = planes[:, :3] @ center + planes[:, 3]
+        reach = radius * np.linalg.norm(planes[:, :3], axis=1)
+
+        # behind the viewer the planes are mirrored, so only decide in front of it
+        if distances[4] - reach[4] > 0:
+            if (distances[:4] + reach[:4] < 0).any():
+                return True, False
+
+            if (distances[:4] - reach[:4] >= 0).all():
+                return False, True
+
+        outside, inside = BoundingVolumeHierarchy.classify(
+            self._bounding_box[None],
+            win_coords_matrix,
+        )
+
+        return bool(outside[0]), bool(inside[0])
+
     def set_window_coordinates(
         self,
         win_coords_matrix: NDArray[np.float64],
@@ -109,36 +321,327 @@ class GeometricObject(Clipping):
         """
         Sets the window coordinates of the object
 
+        @note Objects fully outside the window are not even projected
+
+        @param win_coords_matrix: Matrix to transform the global coordinates
+        into window coordinates
+        """
+        outside, inside = self.classify_bounds(win_coords_matrix)
+
+        if outside:
+            self._pending_window = None
+            self._window_change = None
+            self._window_coordinates = []
+            return
+
+        self.project_primitives(win_coords_matrix, line_clip, inside)
+
+    def project_primitives(
+        self,
+        win_coords_matrix: NDArray[np.float64],
+        line_clip: ClippingAlgo,
+        inside: bool = False,
+    ) -> None:
+        """
+        Sets the window coordinates by projecting the primitives to draw
+
+        @note Curves and surfaces project their cached lines, they are only
+              tessellated again after being transformed or when the window
+              needs them split in another amount of lines or needs segments
+              that were left out
+
+        @param win_coords_matrix: Matrix to transform the global coordinates
+        into window coordinates
+        @param line_clip: Clipping algorithm to use on edges
+        @param inside: Whether the object is known to be fully inside the window,
+        so clipping can be skipped
+        """
+        vertices, offsets = self.get_primitives(self.get_subdivision(win_coords_matrix))
+        projected = vertices @ win_coords_matrix
+        self._pending_window = None
+        self._build_window_coordinates(
+            projected / projected[:, -1:],
+            offsets,
+            line_clip,
+            inside,
+        )
+
+    def set_projected_coordinates(
+        self,
+        normalised: NDArray[np.float64],
+        line_clip: ClippingAlgo,
+        inside: bool = False,
+    ) -> None:
+        """
+        Sets the window coordinates from the already projected vertices
+
+        @note Used by the Display File that projects the whole scene at once,
+              only for objects without a tessellator
+
+        @param normalised: Packed vertices multiplied by the window matrix
+        after the homogeneous divide
+        @param line_clip: Clipping algorithm to use on edges
+        @param inside: Whether the object is known to be fully inside the window,
+        so clipping can be skipped
+        """
+        self._pending_window = None
+        self._build_window_coordinates(normalised, self._offsets, line_clip, inside)
+
+    def reuse_window_coordinates(self, inside: bool = False) -> bool:
+        """
+        Scales and moves the last unclipped window coordinates, then clips them again
+
+        @note Only possible when all window changes since the last evaluation were
+              a 2D scale and offset, like a pan in parallel projection or a zoom,
+              and the cached lines of curves are still enough for the window
+
+        @param inside: Whether the object is known to be fully inside the window,
+        so clipping can be skipped
+
+        @returns: False when the coordinates must be projected again instead
+        """
+        if self._pending_window is None or self._window_change is None:
+            return False
+
+        win_coords_matrix, line_clip = self._pending_window
+
+        # a zoom may need the curves split in more or less lines and
+        # a pan may bring segments that were left out into the window
+        if (
+            self._tessellation is not None
+            and not self._tessellation_covers(self.get_subdivision(win_coords_matrix))
+        ):
+            return False
+
+        scale, offset = self._window_change
+        unclipped = self._unclipped.copy()
+        unclipped[:, :2] = unclipped[:, :2] * scale
+        unclipped[:, :3] = unclipped[:, :3] + offset
+        self._unclipped = unclipped
+        self._pending_window = None
+        self._window_change = (1., np.zeros(3))
+        self._clip_window_coordinates(line_clip, inside)
+
+        return True
+
+    def _build_window_coordinates(
+        self,
+        normalised: NDArray[np.float64],
+        offsets: NDArray[np.int64],
+        line_clip: ClippingAlgo,
+        inside: bool,
+    ) -> None:
+        """
+        Turns the projected primitives into the window coordinates
+
+        @note The unclipped primitives are kept so a pan or a zoom can reuse them
+
+        @param normalised: Packed primitives in window coordinates
+        @param offsets: Where each primitive starts, plus the end of the last
+        @param line_clip: Clipping algorithm to use on edges
+        @param inside: Whether clipping can be skipped
+        """
+        self._unclipped, self._unclipped_offsets = normalised, offsets
+        self._window_change = (1., np.zeros(3))
+        self._clip_window_coordinates(line_clip, inside)
+
+    def get_tessellator(self, subdivision: Subdivision) -> Tessellator | None:
+        """
+        Returns the function that builds the lines of curves and surfaces
+
+        @param subdivision: Depth and segments or patches to build
+
+        @returns: The tessellator, None when the primitives are drawn as they are
+        """
+        return None
+
+    def get_subdivision(self, win_coords_matrix: NDArray[np.float64]) -> Subdivision:
+        """
+        Finds the segments or patches of curves and surfaces that reach the window
+        and how many times they must be halved to be drawn within the tolerance
+
+        @note Segments and patches are inside the convex hull of their control
+              points, so the ones whose hull is outside are never built
+
         @param win_coords_matrix: Matrix to transform the global coordinates
         into window coordinates
+
+        @returns: Subdivision to give to the tessellator, empty for objects without one
+        """
+        return 0, np.empty(0, dtype=np.bool_)
+
+    def set_tessellation_tolerance(self, tolerance: float) -> None:
+        """
+        Sets how far curves and surfaces may be from their lines
+
+        @param tolerance: Maximum distance in window coordinates
+        """
+        self._tolerance = tolerance
+
+    def tessellation_outdated(self, subdivision: Subdivision) -> bool:
+        """
+        Returns whether the object must be tessellated before being projected
+
+        @param subdivision: Subdivision needed by the window
+
+        @returns: True for curves and surfaces transformed since their tessellation
+        or whose cached lines are not enough for the subdivision
+        """
+        return (
+            self.get_tessellator(subdivision) is not None
+            and not self._tessellation_covers(subdivision)
+        )
+
+    def _tessellation_covers(self, subdivision: Subdivision) -> bool:
+        """
+        Returns whether the cached lines can be drawn for a subdivision
+
+        @note Lines of more segments than needed are fine, clipping removes them
+
+        @param subdivision: Subdivision needed by the window
+
+        @returns: True when the depth is the same and no needed segment is missing
+        """
+        # read once, the object may be transformed meanwhile by another thread
+        tessellation = self._tessellation
+
+        if tessellation is None:
+            return False
+
+        (depth, segments), _, _ = tessellation
+
+        return depth == subdivision[0] and bool((segments >= subdivision[1]).all())
+
+    def invalidate_tessellation(self) -> None:
+        """
+        Discards the cached lines of curves and surfaces
+
+        @note Only the shape of the object changes them, the window does not
         """
-        coords: NDArray[np.float64]
-        self._window_coordinates = []
-
-        for coords in self._coordinates:
-            win_coords = coords @ win_coords_matrix
-            win_coords = win_coords / win_coords[:, -1:]
-
-            vertex_count = len(win_coords)
-            obj = None
-            np_win_coords = np.array(win_coords)
-
-            if vertex_count == 1:  # point
-                obj = self.clip_by_point(np_win_coords)
-            elif vertex_count == 2:  # edge
-                if line_clip == ClippingAlgo.Points:
-                    obj = self.clip_by_point(np_win_coords)
-                elif line_clip == ClippingAlgo.CohenSutherland:
-                    obj = self.clip_cohen_sutherland(np_win_coords)
-                elif line_clip == ClippingAlgo.LiangBarsky:
-                    obj = self.clip_liang_barsky(np_win_coords)
-                elif line_clip == ClippingAlgo.NichollLeeNicholl:
-                    obj = self.clip_nicholl_lee_nicholl(np_win_coords)
-            else:  # face
-                obj = self.clip_sutherland_hodgeman(np_win_coords)
-
-            if obj is not None:
-                self._window_coordinates.append(obj)
+        self._tessellation = None
+
+    def set_tessellation(
+        self,
+        polylines: NDArray[np.float64],
+        subdivision: Subdivision,
+    ) -> tuple[Subdivision, NDArray[np.float64], NDArray[np.int64]]:
+        """
+        Caches polylines already built by the tessellator
+
+        @note Used by the Display File when the tessellation runs in other processes
+
+        @param polylines: Polylines of shape (polylines, points, 4) in global
+        coordinates
+        @param subdivision: Subdivision the polylines were built with
+
+        @returns: The cached subdivision, packed vertices and their offsets
+        """
+        self._tessellation = (subdivision, *self._pack_polylines(polylines))
+
+        return self._tessellation
+
+    def get_primitives(
+        self,
+        subdivision: Subdivision,
+    ) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+        """
+        Returns the primitives to draw in global coordinates
+
+        @note Curves and surfaces are tessellated here when their cached lines
+              are not enough for the subdivision
+
+        @param subdivision: Subdivision of curves and surfaces, see `get_subdivision`
+
+        @returns: Packed vertices of the primitives and their offsets
+        """
+        tessellator = self.get_tessellator(subdivision)
+
+        if tessellator is None:
+            return self._vertices, self._offsets
+
+        tessellation = self._tessellation
+
+        if tessellation is None or not self._tessellation_covers(subdivision):
+            tessellation = self.set_tessellation(tessellator(self._vertices), subdivision)
+
+        _, vertices, offsets = tessellation
+
+        return vertices, offsets
+
+    @staticmethod
+    def _pack_polylines(
+        polylines: NDArray[np.float64],
+    ) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+        """
+        Packs polylines as primitives, they all have the same amount of vertices
+
+        @param polylines: Polylines of shape (polylines, points, 4)
+
+        @returns: Packed vertices and their offsets
+        """
+        points = polylines.shape[1]
+
+        return polylines.reshape(-1, 4), np.arange(0, points * len(polylines) + 1, points)
+
+    def _clip_window_coordinates(self, line_clip: ClippingAlgo, inside: bool) -> None:
+        """
+        Clips the unclipped primitives into the window coordinates
+
+        @note Primitives are grouped by type, faces first so points and edges
+              are drawn over them
+
+        @note Polylines are split into the runs that are visible
+
+        @param line_clip: Clipping algorithm to use on edges
+        @param inside: Whether clipping can be skipped
+        """
+        normalised = self._unclipped
+        starts = self._unclipped_offsets[:-1]
+        sizes = np.diff(self._unclipped_offsets)
+
+        if self.POLYLINES:
+            self._window_coordinates = (
+                [
+                    polyline
+                    for polyline in np.split(normalised, self._unclipped_offsets[1:-1])
+                    if len(polyline) > 0
+                ]
+                if inside else
+                self.clip_polylines(normalised, self._unclipped_offsets, line_clip)
+            )
+            return
+
+        if inside:
+            primitives = np.split(normalised, self._unclipped_offsets[1:-1])
+            self._window_coordinates = [
+                primitives[index] for index in np.flatnonzero(sizes > 2)
+            ]
+            self._window_coordinates.extend(
+                normalised[starts[sizes == 2][:, None] + np.arange(2)],
+            )
+            self._window_coordinates.extend(normalised[starts[sizes == 1], None])
+            return
+
+        # gather the faces one after the other to clip them together
+        face_index = np.flatnonzero(sizes > 2)
+        face_sizes = sizes[face_index]
+        face_offsets = np.concatenate(([0], np.cumsum(face_sizes)))
+        faces, face_offsets = self.clip_sutherland_hodgeman_batch(
+            normalised[
+                np.arange(face_offsets[-1])
+                + np.repeat(starts[face_index] - face_offsets[:-1], face_sizes)
+            ],
+            face_offsets,
+        )
+        self._window_coordinates = [
+            face for face in np.split(faces, face_offsets[1:-1]) if len(face) > 0
+        ]
+
+        edges = normalised[starts[sizes == 2][:, None] + np.arange(2)]
+        self._window_coordinates.extend(self.clip_edges(edges, line_clip))
+
+        points = normalised[starts[sizes == 1]]
+        self._window_coordinates.extend(points[self.clip_by_point_mask(points), None])
 
     def transform(
         self,
@@ -151,6 +654,34 @@ class GeometricObject(Clipping):
 
         @param transform_matrix: Transformation Matrix to apply on the obejct
         """
-        self._coordinates = [c @ transform_matrix for c in self._coordinates]
+        self._vertices = self._vertices @ transform_matrix
         self._center = self._center @ transform_matrix
-        self.set_window_coordinates(window_matrix, line_clip)
+        self._bounding_box = self._get_vertices_box()
+        self._bounding_sphere = self._get_vertices_sphere()
+        self.invalidate_tessellation()
+        self.invalidate_window_coordinates(window_matrix, line_clip)
+
+        for listener in self._transform_listeners:
+            listener(self)
+
+    def add_transform_listener(
+        self,
+        listener: Callable[["GeometricObject"], None],
+    ) -> None:
+        """
+        Registers a function to be called after the object is transformed
+
+        @param listener: Function receiving the transformed object
+        """
+        self._transform_listeners.append(listener)
+
+    def remove_transform_listener(
+        self,
+        listener: Callable[["GeometricObject"], None],
+    ) -> None:
+        """
+        Unregisters a function added with `add_transform_listener`
+
+        @param listener: Function previously registered
+        """
+        self._transform_listeners.remove(listener)
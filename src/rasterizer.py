@@ -0,0 +1,260 @@
+import numpy as np
+from numpy.typing import NDArray
+
+from canvas import (
+    BACKGROUND_COLOUR,
+    CLIPPING_AREA_COLOUR,
+    LINE_WIDTH,
+    MARGIN,
+    SELECTED_COLOUR,
+    split_primitives,
+    to_pixels,
+    window_tolerance,
+)
+from displayFile import Frame
+from objects.bounding_volume_hierarchy import ranges_to_indices
+from objects.geometricObject import Colour
+from window import Window
+
+
+def darker(colour: Colour) -> Colour:
+    """
+    Darkens a colour like the outlines of the faces
+
+    @note Matches `QColor.darker(150)` up to rounding
+
+    @param colour: Colour to darken
+
+    @returns: The darker colour
+    """
+    red, green, blue = np.rint(np.array(colour) / 1.5).astype(int)
+
+    return int(red), int(green), int(blue)
+
+
+class Rasterizer:
+    """
+    Draws the window into an RGBA image without Qt
+
+    It draws the same as the viewport without antialiasing, so it runs
+    on machines without a display and always gives the same pixels
+    """
+    def __init__(self, window: Window, width: int, height: int) -> None:
+        """
+        Creates the rasterizer
+
+        @param window: The window this rasterizer will draw
+        @param width: Width of the image in pixels
+        @param height: Height of the image in pixels
+        """
+        self._window = window
+        self._size = (width - 2 * MARGIN, height - 2 * MARGIN)
+        self._image = np.zeros((height, width, 4), dtype=np.uint8)
+        self._tolerance = window_tolerance(self._size)
+        """Tessellation tolerance of the frames drawn by `draw`"""
+
+    def get_image(self) -> NDArray[np.uint8]:
+        """
+        Returns the image
+
+        @note The image is reused by the next draw
+
+        @returns: Image with shape (height, width, 4)
+        """
+        return self._image
+
+    def draw(self, selected: int) -> NDArray[np.uint8]:
+        """
+        Redraws the image according to the window
+
+        @note The window coordinates are evaluated on the calling thread,
+              with a tolerance for the size of the image that only this frame uses
+
+        @param selected: Index of the selected object
+
+        @returns: The image
+        """
+        return self.draw_frame(self._window.get_frame(self._tolerance), selected)
+
+    def draw_frame(self, frame: Frame, selected: int) -> NDArray[np.uint8]:
+        """
+        Redraws the image with window coordinates that were already evaluated
+
+        @note Like on the viewport, the edges and points of the selected object
+              are drawn over all objects
+
+        @param frame: Visible objects and their window coordinates
+        @param selected: Index of the selected object
+
+        @returns: The image
+        """
+        self._image[:] = (*BACKGROUND_COLOUR, 255)
+        self.draw_clipping_area()
+        self.draw_objects(frame, -1)
+        self.draw_objects(
+            [item for item in frame if item[0] == selected],
+            selected,
+            filled=False,
+        )
+
+        return self._image
+
+    def draw_objects(self, frame: Frame, selected: int, filled: bool = True) -> None:
+        """
+        Draws objects batched by colour
+
+        @param frame: Objects to draw and their window coordinates
+        @param selected: Index of the selected object
+        @param filled: Whether the faces are filled or only their outlines are drawn
+        """
+        edges: dict[Colour, list[NDArray[np.float64]]] = {}
+        points: dict[Colour, list[NDArray[np.float64]]] = {}
+
+        for index, obj, geometric_objects in frame:
+            if len(geometric_objects) == 0:
+                continue
+
+            faces, sizes, outlines, lines, pixels = split_primitives(
+                to_pixels(self._size, np.concatenate(geometric_objects)),
+                np.array([len(vertices) for vertices in geometric_objects]),
+                obj.POLYLINES,
+            )
+            fill_colour = obj.get_colour()
+            line_colour = fill_colour if selected != index else SELECTED_COLOUR
+            outline_colour = line_colour if selected == index else darker(line_colour)
+
+            # faces are filled first so all edges and points are drawn over them
+            if filled:
+                self.fill_polygons(faces, sizes, fill_colour)
+
+            points.setdefault(line_colour, []).append(pixels)
+            edges.setdefault(line_colour, []).append(lines)
+            edges.setdefault(outline_colour, []).append(outlines)
+
+        for colour, pairs in edges.items():
+            self.draw_lines(np.concatenate(pairs), colour)
+
+        for colour, batch in points.items():
+            pixels = np.concatenate(batch)
+            self.plot(pixels[:, 0], pixels[:, 1], colour)
+
+    def _pixels(self) -> NDArray[np.uint32]:
+        """
+        Returns the image as one 32 bit value per pixel, one row after the other
+
+        @returns: View of the image with shape (height * width)
+        """
+        return self._image.view(np.uint32).reshape(-1)
+
+    @staticmethod
+    def _pixel_value(colour: Colour) -> np.uint32:
+        """
+        Packs an opaque colour the same way as the pixels of the image
+
+        @param colour: Colour to pack
+
+        @returns: The colour as a single 32 bit value
+        """
+        return np.array((*colour, 255), dtype=np.uint8).view(np.uint32)[0]
+
+    def draw_clipping_area(self) -> None:
+        """
+        Draws the border of the clipping area
+        """
+        left, top = MARGIN, MARGIN
+        right, bottom = MARGIN + self._size[0], MARGIN + self._size[1]
+        self._image[[top, bottom], left:right + 1] = (*CLIPPING_AREA_COLOUR, 255)
+        self._image[top:bottom + 1, [left, right]] = (*CLIPPING_AREA_COLOUR, 255)
+
+    def plot(
+        self,
+        x: NDArray[np.float64],
+        y: NDArray[np.float64],
+        colour: Colour,
+    ) -> None:
+        """
+        Paints a square of the line width centred on each position
+
+        @note Squares that go over the border of the image are skipped,
+              clipped coordinates never reach it because of the margin
+
+        @param x: Horizontal pixel coordinate of each position
+        @param y: Vertical pixel coordinate of each position
+        @param colour: Colour to paint
+        """
+        height, width = self._image.shape[:2]
+        # pixels whose centre is inside the square
+        columns = np.ceil(x - LINE_WIDTH / 2 - .5).astype(np.int64)
+        rows = np.ceil(y - LINE_WIDTH / 2 - .5).astype(np.int64)
+        inside = (
+            (columns >= 0) & (columns <= width - LINE_WIDTH)
+            & (rows >= 0) & (rows <= height - LINE_WIDTH)
+        )
+        corners = rows[inside] * width + columns[inside]
+        offsets = (np.arange(LINE_WIDTH)[:, None] * width + np.arange(LINE_WIDTH)).ravel()
+        self._pixels()[(corners[:, None] + offsets).ravel()] = self._pixel_value(colour)
+
+    def draw_lines(self, pairs: NDArray[np.float64], colour: Colour) -> None:
+        """
+        Draws many lines at once sampling them at most one pixel apart
+
+        @param pairs: Start and end of each line with shape (lines * 2, 2)
+        @param colour: Colour of the lines
+        """
+        starts = pairs[0::2]
+        deltas = pairs[1::2] - starts
+        samples = np.ceil(np.abs(deltas).max(axis=1, initial=0)).astype(np.int64) + 1
+        line = np.repeat(np.arange(len(starts)), samples)
+        step = np.arange(samples.sum()) - np.repeat(np.cumsum(samples) - samples, samples)
+        t = step / np.maximum(samples - 1, 1)[line]
+        positions = starts[line] + deltas[line] * t[:, None]
+        self.plot(positions[:, 0], positions[:, 1], colour)
+
+    def fill_polygons(
+        self,
+        pixels: NDArray[np.float64],
+        sizes: NDArray[np.int64],
+        colour: Colour,
+    ) -> None:
+        """
+        Fills many polygons at once with the odd-even rule
+
+        All edges of all polygons are intersected with the rows of pixels together,
+        the crossings of each row of each polygon are then paired into spans
+
+        @param pixels: Pixel coordinates of the vertices of all polygons
+        with shape (vertices, 2)
+        @param sizes: Amount of vertices of each polygon
+        @param colour: Colour to fill
+        """
+        if len(sizes) == 0:
+            return
+
+        height, width = self._image.shape[:2]
+        ends = np.cumsum(sizes)
+        following = np.arange(len(pixels)) + 1
+        following[ends - 1] = ends - sizes
+        polygon = np.repeat(np.arange(len(sizes)), sizes)
+        x0, y0 = pixels[:, 0], pixels[:, 1]
+        x1, y1 = pixels[following, 0], pixels[following, 1]
+
+        # rows whose centre each edge crosses, a vertex shared by two edges
+        # only counts for one of them
+        first = np.clip(np.ceil(np.minimum(y0, y1) - .5), 0, height).astype(np.int64)
+        last = np.clip(np.ceil(np.maximum(y0, y1) - .5), 0, height).astype(np.int64)
+        edge = np.repeat(np.arange(len(pixels)), last - first)
+        rows = ranges_to_indices(first, last)
+        crossings = x0[edge] + (
+            (rows + .5 - y0[edge]) * (x1 - x0)[edge] / (y1 - y0)[edge]
+        )
+
+        order = np.lexsort((crossings, rows, polygon[edge]))
+        crossings = crossings[order]
+        rows = rows[order][0::2]
+        # pixels whose centre is between each pair of crossings
+        left = np.clip(np.ceil(crossings[0::2] - .5), 0, width).astype(np.int64)
+        right = np.clip(np.ceil(crossings[1::2] - .5), 0, width).astype(np.int64)
+        right = np.maximum(left, right)
+        self._pixels()[
+            ranges_to_indices(left + rows * width, right + rows * width)
+        ] = self._pixel_value(colour)
@@ -0,0 +1,137 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from numpy.typing import NDArray
+
+from objects.geometricObject import Tessellator
+
+
+def _tessellate_shared(
+    tessellator: Tessellator,
+    name: str,
+    start: int,
+    end: int,
+) -> tuple[str, tuple[int, ...]]:
+    """
+    Tessellates control points read from shared memory into new shared memory
+
+    @note Runs in the tessellation processes
+
+    @param tessellator: Function that builds the polylines
+    @param name: Shared memory holding the control points of all jobs
+    @param start: First control point of this job
+    @param end: End (exclusive) of the control points of this job
+
+    @returns: Shared memory holding the polylines and their shape
+    """
+    shared = SharedMemory(name=name)
+    control_points = np.ndarray((end, 4), dtype=np.float64, buffer=shared.buf)[start:]
+    polylines = tessellator(np.array(control_points))
+    del control_points
+    shared.close()
+
+    result = SharedMemory(create=True, size=max(1, polylines.nbytes))
+    np.ndarray(polylines.shape, dtype=np.float64, buffer=result.buf)[:] = polylines
+    result.close()
+
+    return result.name, polylines.shape
+
+
+def _receive_shared(name: str, shape: tuple[int, ...]) -> NDArray[np.float64]:
+    """
+    Copies the polylines out of the shared memory created by a tessellation process
+
+    @note The shared memory is freed afterwards
+
+    @param name: Shared memory holding the polylines
+    @param shape: Shape of the polylines
+
+    @returns: The polylines
+    """
+    shared = SharedMemory(name=name)
+    polylines = np.array(np.ndarray(shape, dtype=np.float64, buffer=shared.buf))
+    shared.close()
+    shared.unlink()
+
+    return polylines
+
+
+class TessellationService:
+    """
+    Tessellates curves and surfaces in other processes
+
+    Control points and polylines go through shared memory, only the names
+    and shapes of the buffers are sent between the processes
+    """
+    def __init__(self, processes: int) -> None:
+        """
+        Starts the tessellation processes
+
+        @note Processes are spawned, so the main script must be import safe
+
+        @param processes: Amount of processes
+        """
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=get_context("spawn"),
+        )
+
+    def tessellate(
+        self,
+        jobs: list[tuple[Tessellator, NDArray[np.float64]]],
+    ) -> list[NDArray[np.float64]]:
+        """
+        Tessellates many objects at once, spread over the processes
+
+        @param jobs: Tessellator and control points of each object
+
+        @returns: Polylines of shape (polylines, points, 4) of each object,
+        in the jobs order
+        """
+        sizes = np.array([len(control_points) for _, control_points in jobs])
+        offsets = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+        shared = SharedMemory(create=True, size=max(1, int(offsets[-1]) * 4 * 8))
+
+        try:
+            buffer = np.ndarray((offsets[-1], 4), dtype=np.float64, buffer=shared.buf)
+
+            for (_, control_points), start, end in zip(jobs, offsets, offsets[1:]):
+                buffer[start:end] = control_points
+
+            del buffer
+            futures = [
+                self._executor.submit(
+                    _tessellate_shared,
+                    tessellator,
+                    shared.name,
+                    int(start),
+                    int(end),
+                )
+                for (tessellator, _), start, end in zip(jobs, offsets, offsets[1:])
+            ]
+
+            results: list[NDArray[np.float64]] = []
+            error: Exception | None = None
+
+            # every finished job holds a buffer that must be freed, even on errors
+            for future in futures:
+                try:
+                    results.append(_receive_shared(*future.result()))
+                except Exception as e:
+                    error = error or e
+
+            if error is not None:
+                raise error
+
+            return results
+        finally:
+            shared.close()
+            shared.unlink()
+
+    def shutdown(self) -> None:
+        """
+        Stops the tessellation processes
+        """
+        self._executor.shutdown(cancel_futures=True)
@@ -42,8 +42,9 @@ class CreateObjectDialog(QtWidgets.QDialog, Ui_CreateObjectDialog):
             "bezier_curve": "Bézier curves requires a minimum of 4 points and then 3 "
             + "more per segment",
             "bspline_curve": "B-Spline curves requires a minimum of 4 points",
-            "bezier_surface": "Bézier surfaces require a 4x4 matriz of points, separate "
-            + "lines of the matrix with semicolon (;)",
+            "bezier_surface": "Bézier surfaces require a 4x4 matriz of points and then 3 "
+            + "more lines or columns per patch, separate lines of the matrix with "
+            + "semicolon (;)",
             "bspline_surface": "B-Spline surfaces require a minimum 4x4 matriz of points,"
             + " up to 20x20, separate lines of the matrix with semicolon (;)",
             "bad_coords": "Coordinates are not in the expected format",
@@ -127,7 +128,7 @@ class CreateObjectDialog(QtWidgets.QDialog, Ui_CreateObjectDialog):
                     vertices = tuple(eval(text + ","))
                     self.check_vertices(vertices)
                 elif len(vertices_matrix) > 3:
-                    bezier_surface = len(vertices_matrix) == 4
+                    bezier_surface = len(vertices_matrix) % 3 == 1
                     bspline_surface = True
                     vertices_count: int | None = None
 
@@ -137,8 +138,9 @@ class CreateObjectDialog(QtWidgets.QDialog, Ui_CreateObjectDialog):
 
                         if vertices_count and vertices_count != len(vertices_line):
                             bspline_surface = False
+                            bezier_surface = False
 
-                        if len(vertices_line) != 4:
+                        if len(vertices_line) < 4 or len(vertices_line) % 3 != 1:
                             bezier_surface = False
 
                         vertices_count = len(vertices_line)
@@ -147,7 +149,7 @@ class CreateObjectDialog(QtWidgets.QDialog, Ui_CreateObjectDialog):
                     self.checkBoxBezierSurface.setChecked(True)
                     self.checkBoxBezierSurface.setEnabled(True)
                     self.checkBoxBezierSurface.setToolTip(
-                        "Create a Bézier Surface with 16 control points",
+                        "Create a Bézier Surface with patches of 16 control points",
                     )
                 else:
                     self.checkBoxBezierSurface.setChecked(False)
@@ -263,21 +265,16 @@ class CreateObjectDialog(QtWidgets.QDialog, Ui_CreateObjectDialog):
                 vertices_tuples: list[tuple[tuple[float, float, float], ...]] = [
                     eval(vertices_str) for vertices_str in vertices_matrix
                 ]
-                vertices: VerticesList = []
+                matrix = np.array(
+                    [
+                        [(*v, 1) for v in vertices_list]
+                        for vertices_list in vertices_tuples
+                    ],
+                )
 
                 if self.checkBoxBezierSurface.isChecked():
-                    for vertices_list in vertices_tuples:
-                        for v in vertices_list:
-                            vertices.append((*v, 1))
-
-                    self._callback(BezierSurface(name, colour, vertices))
+                    self._callback(BezierSurface(name, colour, matrix))
                 elif self.checkBoxBSplineSurface.isChecked():
-                    matrix = np.array(
-                        [
-                            [(*v, 1) for v in vertices_list]
-                            for vertices_list in vertices_tuples
-                        ],
-                    )
                     self._callback(BSplineSurface(name, colour, matrix))
                 return
 
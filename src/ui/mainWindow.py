@@ -1,8 +1,11 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
+
 from PyQt6 import QtCore, QtGui, QtWidgets
 from PyQt6.QtCore import Qt
 import numpy as np
 
-from displayFile import DisplayFile
+from displayFile import DisplayFile, Frame
 from io_files.wavefront_obj import WavefrontDescriptor
 from objects.bspline_surface import BSplineSurface
 from objects.clipping import ClippingAlgo
@@ -15,9 +18,18 @@ from ui.transformDialog import TransformDialog
 from viewport import Viewport
 from window import Window
 
+WORKERS = min(4, os.cpu_count() or 1)
+"""Threads evaluating the window coordinates of the objects"""
+TESSELLATION_PROCESSES = min(4, (os.cpu_count() or 1) - 1)
+"""Processes tessellating curves and surfaces, none on machines with a single core"""
+
 
 class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
     """Main UI window"""
+    frame_ready = QtCore.pyqtSignal(object)
+    """Emitted from the frame worker with a frame that finished evaluating"""
+    frame_failed = QtCore.pyqtSignal(object)
+    """Emitted from the frame worker with the error that stopped an evaluation"""
 
     def __init__(self, icons: dict[str, QtGui.QIcon], *args, **kwargs) -> None:
         super(MainWindow, self).__init__(*args, **kwargs)
@@ -165,9 +177,20 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         self.objectsList.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.objectsList.customContextMenuRequested.connect(self.context_menu_event)
 
-        self._display_file = DisplayFile(self._clipping_algorithm)
+        self._display_file = DisplayFile(self._clipping_algorithm, WORKERS)
+        self._display_file.set_tessellation_processes(TESSELLATION_PROCESSES)
         self._window_obj = Window(self._display_file, (0, 0, 0), (200, 200, 0))
         self._viewport = Viewport(self._window_obj, self.viewportCanvas)
+        # draws are coalesced so a burst of events only draws the latest state
+        self._draw_timer = QtCore.QTimer(self)
+        self._draw_timer.setSingleShot(True)
+        self._draw_timer.timeout.connect(self.draw_frame)
+        # window coordinates are evaluated in a worker so the UI never freezes,
+        # the viewport always shows the last frame that finished
+        self._frame_executor = ThreadPoolExecutor(max_workers=1)
+        self._frame_future: Future[None] | None = None
+        self.frame_ready.connect(self.paint_frame)
+        self.frame_failed.connect(self.raise_frame_error)
         self._mouse_coordinate: QtCore.QPointF | None = None
         self._mouse_modifiers: Qt.KeyboardModifier = Qt.KeyboardModifier.NoModifier
         self.viewportCanvas.wheelEvent = self.mouse_scroll_event
@@ -191,7 +214,87 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         ))
         self._viewport.draw(-1)
 
-        self.objectsList.currentRowChanged.connect(lambda row: self._viewport.draw(row))
+        self.objectsList.currentRowChanged.connect(lambda _: self.schedule_draw())
+
+    def schedule_draw(self) -> None:
+        """
+        Requests the viewport to be drawn on the next screen refresh
+
+        @note Changes done before the refresh are drawn together in a single frame
+        """
+        if self._draw_timer.isActive():
+            return
+
+        screen = self.screen()
+        refresh_rate = screen.refreshRate() if screen else 0
+        self._draw_timer.start(int(1000 / (refresh_rate if refresh_rate > 0 else 60)))
+
+    def draw_frame(self) -> None:
+        """
+        Starts evaluating a frame with the current state of the window and the objects
+
+        @note A running evaluation is cancelled by any newer change,
+              so a new one is only started after it stops
+        """
+        if self._frame_future is not None and not self._frame_future.done():
+            self.schedule_draw()
+            return
+
+        self._frame_future = self._frame_executor.submit(
+            self._evaluate_frame,
+            self._display_file.get_generation(),
+        )
+        self._frame_future.add_done_callback(self._frame_done)
+
+    def _frame_done(self, future: Future[None]) -> None:
+        """
+        Sends the error of a failed evaluation to the UI thread
+
+        @note Runs in the frame worker thread
+
+        @param future: The finished evaluation
+        """
+        if not future.cancelled() and future.exception() is not None:
+            self.frame_failed.emit(future.exception())
+
+    def _evaluate_frame(self, generation: int) -> None:
+        """
+        Evaluates a frame and sends it to be painted
+
+        @note Runs in the frame worker thread
+
+        @param generation: Display file generation the frame is for
+        """
+        frame = self._display_file.get_frame(generation)
+
+        if frame is not None:
+            self.frame_ready.emit(frame)
+
+    def raise_frame_error(self, error: BaseException) -> None:
+        """
+        Raises the error of a failed evaluation on the UI thread,
+        like it would if the frame was evaluated there
+
+        @param error: The error that stopped the evaluation
+        """
+        raise error
+
+    def paint_frame(self, frame: Frame) -> None:
+        """
+        Paints an evaluated frame on the viewport
+
+        @param frame: Visible objects and their window coordinates
+        """
+        self._viewport.draw_frame(frame, self.objectsList.currentRow())
+
+    def closeEvent(self, a0: QtGui.QCloseEvent | None) -> None:  # noqa: N802
+        """
+        Stops the frame worker and the display file workers and processes
+        before closing the window
+        """
+        self._frame_executor.shutdown(cancel_futures=True)
+        self._display_file.shutdown()
+        super().closeEvent(a0)
 
     def context_menu_event(self, click_position: QtCore.QPoint) -> None:
         """
@@ -238,7 +341,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
                 self._window_obj.zoom(
                     1 - (2 * delta.y() / (self.viewportCanvas.height() - 2)),
                 )
-            self._viewport.draw(self.objectsList.currentRow())
+            self.schedule_draw()
             self._mouse_coordinate = ev.position()
 
     @QtCore.pyqtSlot(QtCore.QPoint)
@@ -354,49 +457,49 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         if obj_index > -1 and obj_index < self.objectsList.count():
             self.objectsList.takeItem(obj_index)
             self._display_file.remove(obj_index)
-            self._viewport.draw(self.objectsList.currentRow())
+            self.schedule_draw()
 
     def action_move_left(self) -> None:
         """
         Click on move left button
         """
         self._window_obj.move(-0.03, 0)
-        self._viewport.draw(self.objectsList.currentRow())
+        self.schedule_draw()
 
     def action_move_right(self) -> None:
         """
         Click on move right button
         """
         self._window_obj.move(0.03, 0)
-        self._viewport.draw(self.objectsList.currentRow())
+        self.schedule_draw()
 
     def action_move_up(self) -> None:
         """
         Click on move up button
         """
         self._window_obj.move(0, 0.03)
-        self._viewport.draw(self.objectsList.currentRow())
+        self.schedule_draw()
 
     def action_move_down(self) -> None:
         """
         Click on move down button
         """
         self._window_obj.move(0, -0.03)
-        self._viewport.draw(self.objectsList.currentRow())
+        self.schedule_draw()
 
     def action_zoom_out(self) -> None:
         """
         Click on zoom out button
         """
         self._window_obj.zoom(1.25)
-        self._viewport.draw(self.objectsList.currentRow())
+        self.schedule_draw()
 
     def action_zoom_in(self) -> None:
         """
         Click on zoom in button
         """
         self._window_obj.zoom(0.8)
-        self._viewport.draw(self.objectsList.currentRow())
+        self.schedule_draw()
 
     def action_rotate_clockwise(self) -> None:
         """
@@ -407,7 +510,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         try:
             angle = float(self.rotationAngleField.text())
             self._window_obj.roll(angle)
-            self._viewport.draw(self.objectsList.currentRow())
+            self.schedule_draw()
         except Exception:
             pass
 
@@ -420,7 +523,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         try:
             angle = -float(self.rotationAngleField.text())
             self._window_obj.roll(angle)
-            self._viewport.draw(self.objectsList.currentRow())
+            self.schedule_draw()
         except Exception:
             pass
 
@@ -433,7 +536,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         try:
             angle = float(self.rotationAngleField.text())
             self._window_obj.yaw(angle)
-            self._viewport.draw(self.objectsList.currentRow())
+            self.schedule_draw()
         except Exception:
             pass
 
@@ -446,7 +549,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         try:
             angle = -float(self.rotationAngleField.text())
             self._window_obj.yaw(angle)
-            self._viewport.draw(self.objectsList.currentRow())
+            self.schedule_draw()
         except Exception:
             pass
 
@@ -459,7 +562,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         try:
             angle = float(self.rotationAngleField.text())
             self._window_obj.pitch(angle)
-            self._viewport.draw(self.objectsList.currentRow())
+            self.schedule_draw()
         except Exception:
             pass
 
@@ -472,19 +575,19 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         try:
             angle = -float(self.rotationAngleField.text())
             self._window_obj.pitch(angle)
-            self._viewport.draw(self.objectsList.currentRow())
+            self.schedule_draw()
         except Exception:
             pass
 
     def action_projection_parallel(self, state: bool) -> None:
         if state:
             self._window_obj.set_projection_parallel()
-            self._viewport.draw(self.objectsList.currentRow())
+            self.schedule_draw()
 
     def action_projection_perspective(self, state: bool) -> None:
         if state:
             self._window_obj.set_projection_perspective()
-            self._viewport.draw(self.objectsList.currentRow())
+            self.schedule_draw()
 
     def action_projection_toggle(self) -> None:
         d = self._window_obj.get_z_clip()
@@ -494,14 +597,14 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         else:
             self._window_obj.set_projection_parallel()
             self.projectionRadioParallel.setChecked(True)
-        self._viewport.draw(self.objectsList.currentRow())
+        self.schedule_draw()
 
     def action_rotate_reset(self, x: float, y: float) -> None:
         """
         Resets the rotation back to Y and V being aligned
         """
         self._window_obj.set_angles(x, y, 0)
-        self._viewport.draw(self.objectsList.currentRow())
+        self.schedule_draw()
 
     def action_set_clipping_algorithm(
         self,
@@ -514,7 +617,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         """
         self._clipping_algorithm = clipping_algorithm
         self._display_file.set_clipping_algorithm(clipping_algorithm)
-        self._viewport.draw(self.objectsList.currentRow())
+        self.schedule_draw()
         self._clipping_status.setText(
             "Clipping: {}".format(self._clipping_algorithm.name),
         )
@@ -533,7 +636,7 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
             "{} [{}]".format(obj.get_name(), obj.get_type()),
             self.objectsList,
         )
-        self._viewport.draw(self.objectsList.currentRow())
+        self.schedule_draw()
 
     def action_window_transform_object_translate(self) -> None:
         """
@@ -566,10 +669,9 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
                 geometric_obj=obj,
                 window=self._window_obj,
                 tab=tab,
-                clipping_algorithm=self._clipping_algorithm,
             )
             dialog.exec()
-            self._viewport.draw(self.objectsList.currentRow())
+            self.schedule_draw()
 
     def action_import_obj(self) -> None:
         """
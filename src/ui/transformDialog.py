@@ -5,7 +5,6 @@ from PyQt6 import QtCore, QtGui, QtWidgets
 import numpy as np
 from numpy.typing import NDArray
 
-from objects.clipping import ClippingAlgo
 from objects.geometricObject import GeometricObject
 import transformation as transform
 from ui.generated.transformDialog import Ui_TransformDialog
@@ -24,7 +23,6 @@ class TransformDialog(QtWidgets.QDialog, Ui_TransformDialog):
         self,
         geometric_obj: GeometricObject,
         window: Window,
-        clipping_algorithm: ClippingAlgo,
         tab: Tab = Tab.Translate,
         *args,
         **kwargs,
@@ -62,7 +60,6 @@ class TransformDialog(QtWidgets.QDialog, Ui_TransformDialog):
         self.inputRotationPointZ2.setValidator(QtGui.QRegularExpressionValidator(re))
         self.tabWidgetTransformations.setCurrentIndex(tab)
 
-        self._line_clip = clipping_algorithm
         self._window = window
         self._geometric_obj = geometric_obj
         self._obj_center = self._geometric_obj.get_center()
@@ -76,18 +73,10 @@ class TransformDialog(QtWidgets.QDialog, Ui_TransformDialog):
         """
         if len(self._transform_list) == 1:
             transform_matrix = self._transform_list[0]
-            self._geometric_obj.transform(
-                transform_matrix,
-                self._window.get_scn_matrix(),
-                self._line_clip,
-            )
+            self._window.transform_object(self._geometric_obj, transform_matrix)
         elif len(self._transform_list) > 1:
             transform_matrix = np.linalg.multi_dot(self._transform_list)
-            self._geometric_obj.transform(
-                transform_matrix,
-                self._window.get_scn_matrix(),
-                self._line_clip,
-            )
+            self._window.transform_object(self._geometric_obj, transform_matrix)
         self.close()
 
     def event_scale_aspect_changed(self, checked: int) -> None:
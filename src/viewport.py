@@ -1,9 +1,50 @@
-from PyQt6 import QtCore, QtGui, QtWidgets
+import numpy as np
+from numpy.typing import NDArray
+from PyQt6 import QtCore, QtGui, QtWidgets, sip
 
+from canvas import (
+    BACKGROUND_COLOUR,
+    CLIPPING_AREA_COLOUR,
+    LINE_WIDTH,
+    MARGIN,
+    SELECTED_COLOUR,
+    split_primitives,
+    to_pixels,
+    window_tolerance,
+)
+from displayFile import Frame
+from objects.geometricObject import GeometricObject
 from window import Window
 
-MARGIN = 20
-"""Clipping margin"""
+DisplayList = tuple[
+    list[sip.array],
+    NDArray[np.float64],
+    NDArray[np.float64],
+    NDArray[np.float64],
+]
+"""
+Faces, point pairs of the outlines of the faces, point pairs of the lines
+and polylines and points of an object in pixels, ready to be drawn with any pen
+"""
+
+
+def point_array(pixels: NDArray[np.float64]) -> "sip.array[QtCore.QPointF | None]":
+    """
+    Copies pixel coordinates into an array of points that Qt draws in a single call
+
+    @param pixels: Pixel coordinates with shape (points, 2)
+
+    @returns: Array of QPointF sharing the same memory layout
+    """
+    # the stubs of sip.array miss its constructor and buffer protocol
+    array: sip.array[QtCore.QPointF | None] = sip.array(  # type: ignore[call-arg]
+        QtCore.QPointF,
+        len(pixels),
+    )
+    points = np.frombuffer(array, dtype=np.float64)  # type: ignore[call-overload]
+    points.reshape(-1, 2)[:] = pixels
+
+    return array
 
 
 class Viewport:
@@ -24,8 +65,18 @@ class Viewport:
             (viewport_canvas.width() - 2),
             (viewport_canvas.height() - 2),
         )
+        self._static_layer = QtGui.QPixmap(self._canvas.size())
+        """Background, clipping area and all objects drawn without selection"""
+        self._static_frame: Frame | None = None
+        """Frame the static layer was drawn from"""
         self._viewport_canvas = viewport_canvas
-        self._selected_colour = QtGui.QColor(246, 158, 67)
+        self._selected_colour = QtGui.QColor(*SELECTED_COLOUR)
+        self._display_lists: dict[
+            GeometricObject,
+            tuple[list[NDArray[np.float64]], DisplayList],
+        ] = {}
+        """Display list of each object and the window coordinates it was built from"""
+        self._window.set_tessellation_tolerance(window_tolerance(self._size))
 
     def get_canvas(self) -> QtGui.QPixmap:
         """
@@ -46,62 +97,194 @@ class Viewport:
     def draw(self, selected: int) -> None:
         """
         Redraws the viewport according to the window
+
+        @note The window coordinates are evaluated on the calling thread
+
+        @param selected: Index of the selected object
         """
+        self.draw_frame(self._window.get_frame(), selected)
+
+    def draw_frame(self, frame: Frame, selected: int) -> None:
+        """
+        Redraws the viewport with window coordinates that were already evaluated
+
+        @note The static layer is only redrawn when the frame changed,
+              a new selection just draws the edges and points of the selected
+              object over it
+
+        @param frame: Visible objects and their window coordinates
+        @param selected: Index of the selected object
+        """
+        if self.static_layer_outdated(frame):
+            self.draw_static_layer(frame)
+
         painter = QtGui.QPainter(self.get_canvas())
         painter.setRenderHints(QtGui.QPainter.RenderHint.Antialiasing)
-        painter.setBackground(QtGui.QColor(61, 61, 61))
+        painter.drawPixmap(0, 0, self._static_layer)
+        # the faces of the selected object are already on the static layer,
+        # filling them again would hide what was drawn over them
+        self.draw_objects(
+            painter,
+            [item for item in frame if item[0] == selected],
+            selected,
+            filled=False,
+        )
+        painter.end()
+        self.get_viewport_canvas().setPixmap(self.get_canvas())
+
+    def static_layer_outdated(self, frame: Frame) -> bool:
+        """
+        Checks if the static layer was drawn from a different frame
+
+        @note Window coordinates are replaced whenever they change,
+              so they are compared by identity
+
+        @param frame: Visible objects and their window coordinates
+
+        @returns: Whether the static layer must be redrawn
+        """
+        if self._static_frame is None or len(frame) != len(self._static_frame):
+            return True
+
+        return any(
+            index != static_index
+            or obj is not static_obj
+            or geometric_objects is not static_geometric_objects
+            for (index, obj, geometric_objects), (
+                static_index,
+                static_obj,
+                static_geometric_objects,
+            ) in zip(frame, self._static_frame)
+        )
+
+    def draw_static_layer(self, frame: Frame) -> None:
+        """
+        Redraws the background, the clipping area and all objects without selection
+
+        @param frame: Visible objects and their window coordinates
+        """
+        painter = QtGui.QPainter(self._static_layer)
+        painter.setRenderHints(QtGui.QPainter.RenderHint.Antialiasing)
+        painter.setBackground(QtGui.QColor(*BACKGROUND_COLOUR))
         painter.setBackgroundMode(QtCore.Qt.BGMode.OpaqueMode)
-        painter.eraseRect(self._canvas.rect())
-        objects = self._window.get_visible_objects()
-        pen = QtGui.QPen()
-        pen.setWidth(2)
+        painter.eraseRect(self._static_layer.rect())
 
         self.draw_clipping_area(painter)
+        self.draw_objects(painter, frame, -1)
+        painter.end()
+
+        self._static_frame = frame
+        # objects out of the frame are dropped from the cache
+        self._display_lists = {
+            obj: self._display_lists[obj]
+            for _, obj, _ in frame
+            if obj in self._display_lists
+        }
+
+    def draw_objects(
+        self,
+        painter: QtGui.QPainter,
+        frame: Frame,
+        selected: int,
+        filled: bool = True,
+    ) -> None:
+        """
+        Draws objects from their display lists
+
+        @note Primitives are batched by colour, each batch of lines or points
+              is submitted to Qt in a single call
+
+        @note Display lists are only rebuilt for objects whose window
+              coordinates changed
+
+        @param painter: Painter to draw with
+        @param frame: Objects to draw and their window coordinates
+        @param selected: Index of the selected object
+        @param filled: Whether the faces are filled or only their outlines are drawn
+        """
+        # batches keyed by the RGBA of their colour
+        fills: list[tuple[QtGui.QColor, list[sip.array]]] = []
+        edges: dict[int, list[NDArray[np.float64]]] = {}
+        points: dict[int, list[NDArray[np.float64]]] = {}
 
-        for index, obj in enumerate(objects):
+        for index, obj, geometric_objects in frame:
+            if len(geometric_objects) == 0:
+                continue
+
+            cached = self._display_lists.get(obj)
+
+            if cached is None or cached[0] is not geometric_objects:
+                cached = (
+                    geometric_objects,
+                    self.build_display_list(geometric_objects, obj.POLYLINES),
+                )
+                self._display_lists[obj] = cached
+
+            faces, outlines, lines, pixels = cached[1]
             fill_colour = QtGui.QColor(*obj.get_colour())
             line_colour = fill_colour if selected != index else self._selected_colour
-            pen.setColor(line_colour)
-            painter.setPen(pen)
+            outline_colour = line_colour if selected == index else line_colour.darker(150)
+
+            if filled and len(faces) > 0:
+                fills.append((fill_colour, faces))
+
+            points.setdefault(line_colour.rgba(), []).append(pixels)
+            edges.setdefault(line_colour.rgba(), []).append(lines)
+            edges.setdefault(outline_colour.rgba(), []).append(outlines)
+
+        # faces are filled first so all edges and points are drawn over them
+        painter.setPen(QtCore.Qt.PenStyle.NoPen)
+
+        for fill_colour, faces in fills:
             painter.setBrush(fill_colour)
-            geometric_objects = obj.get_window_coordinates()
-
-            for vertices in geometric_objects:
-                if len(vertices) == 1:  # point
-                    painter.drawPoint(
-                        QtCore.QPointF(
-                            self._window.get_xw(vertices[0][0]) * self._size[0] + MARGIN,
-                            self._window.get_yw(vertices[0][1]) * self._size[1] + MARGIN,
-                        ),
-                    )
-                elif len(vertices) == 2:  # line
-                    painter.drawLine(
-                        QtCore.QPointF(
-                            self._window.get_xw(vertices[0][0]) * self._size[0] + MARGIN,
-                            self._window.get_yw(vertices[0][1]) * self._size[1] + MARGIN,
-                        ),
-                        QtCore.QPointF(
-                            self._window.get_xw(vertices[1][0]) * self._size[0] + MARGIN,
-                            self._window.get_yw(vertices[1][1]) * self._size[1] + MARGIN,
-                        ),
-                    )
-                else:  # polygon
-                    if selected != index:
-                        pen.setColor(line_colour.darker(150))
-
-                    painter.setPen(pen)
-                    painter.drawPolygon(QtGui.QPolygonF([
-                        QtCore.QPointF(
-                            self._window.get_xw(coord[0]) * self._size[0] + MARGIN,
-                            self._window.get_yw(coord[1]) * self._size[1] + MARGIN,
-                        ) for coord in vertices
-                    ]))
 
-        painter.end()
-        self.get_viewport_canvas().setPixmap(self.get_canvas())
+            for face in faces:
+                painter.drawPolygon(face)
+
+        pen = QtGui.QPen()
+        pen.setWidth(LINE_WIDTH)
+
+        for batches, draw in ((edges, painter.drawLines), (points, painter.drawPoints)):
+            for colour, batch in batches.items():
+                pixels = np.concatenate(batch)
+
+                if len(pixels) == 0:
+                    continue
+
+                pen.setColor(QtGui.QColor.fromRgba(colour))
+                painter.setPen(pen)
+                draw(point_array(pixels))
+
+    def build_display_list(
+        self,
+        geometric_objects: list[NDArray[np.float64]],
+        polylines: bool,
+    ) -> DisplayList:
+        """
+        Converts the window coordinates of an object into Qt primitives
+
+        @param geometric_objects: Window coordinates of each primitive
+        @param polylines: Whether primitives of more than 2 vertices are open polylines
+
+        @returns: Display list of the object
+        """
+        face_pixels, sizes, outlines, lines, points = split_primitives(
+            to_pixels(self._size, np.concatenate(geometric_objects)),
+            np.array([len(vertices) for vertices in geometric_objects]),
+            polylines,
+        )
+        face_ends = np.cumsum(sizes)
+        faces = point_array(face_pixels)
+
+        return (
+            [faces[start:end] for start, end in zip(face_ends - sizes, face_ends)],
+            outlines,
+            lines,
+            points,
+        )
 
     def draw_clipping_area(self, painter: QtGui.QPainter) -> None:
-        line_colour = QtGui.QColor(QtGui.QColor(79, 79, 79))
+        line_colour = QtGui.QColor(*CLIPPING_AREA_COLOUR)
         pen = QtGui.QPen(line_colour)
         pen.setWidth(1)
         painter.setPen(pen)
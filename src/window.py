@@ -1,8 +1,8 @@
 import numpy as np
 from numpy.typing import NDArray
 
-from displayFile import DisplayFile
-from objects.geometricObject import Coordinate
+from displayFile import DisplayFile, Frame
+from objects.geometricObject import Coordinate, GeometricObject
 from transformation import (
     rotate_around_x,
     rotate_around_y,
@@ -42,15 +42,29 @@ class Window:
         self._d = 100
         self.update_scn_matrix()
 
-    def get_visible_objects(self):
+    def get_frame(self, tolerance: float | None = None) -> Frame:
         """
-        Returns the list of visible objects inside the window
+        Returns the visible objects with their window coordinates
 
-        @note Not yet implemented, only returns the whole world
+        @param tolerance: Tessellation tolerance of this frame only,
+        None to use the one set on the window
 
-        @returns: The display file list
+        @returns: Index in the display file, object and window coordinates
         """
-        return self._display_file.objects()
+        return self._display_file.get_frame(tolerance=tolerance) or []
+
+    def transform_object(
+        self,
+        obj: GeometricObject,
+        transform_matrix: NDArray[np.float64],
+    ) -> None:
+        """
+        Transforms an object of the world
+
+        @param obj: Object to transform
+        @param transform_matrix: Transformation matrix to apply on the object
+        """
+        self._display_file.transform(obj, transform_matrix)
 
     def get_xw(self, xw: float) -> float:
         """
@@ -102,14 +116,31 @@ class Window:
             ])
         return scn
 
-    def update_scn_matrix(self) -> None:
+    def update_scn_matrix(
+        self,
+        scale: float | None = None,
+        offset: NDArray[np.float64] | None = None,
+    ) -> None:
         """
         Updates the SCN transformation matrix for the current params
+
+        @param scale: Factor the change applies to X and Y of the window coordinates
+        @param offset: Amount the change adds to X, Y and Z of the window coordinates
         """
         self._display_file.set_scn_matrix(
             self.get_scn_matrix(),
+            scale,
+            offset,
         )
 
+    def set_tessellation_tolerance(self, tolerance: float) -> None:
+        """
+        Sets how far curves and surfaces may be from the lines drawn for them
+
+        @param tolerance: Maximum distance in window coordinates
+        """
+        self._display_file.set_tessellation_tolerance(tolerance)
+
     def set_projection_parallel(self) -> None:
         self._d = 1
         self.update_scn_matrix()
@@ -139,8 +170,7 @@ class Window:
         ) @ rotate_matrix_z(
             -self._rz * np.pi / 180,
         )
-        self._wcenter = self._wcenter + amount[:3]
-        self.update_scn_matrix()
+        self._move_center(amount[:3])
 
     def pan(self, dx: float, dy: float) -> None:
         """
@@ -164,8 +194,7 @@ class Window:
         ) @ rotate_matrix_z(
             -self._rz * np.pi / 180,
         )
-        self._wcenter = self._wcenter + amount[:3]
-        self.update_scn_matrix()
+        self._move_center(amount[:3])
 
     def zoom(self, times: float) -> None:
         """
@@ -174,7 +203,26 @@ class Window:
         @param times: How many times the sizes should be adjusted
         """
         self._size = np.array([self._size[0] * times, self._size[1] * times, 1])
-        self.update_scn_matrix()
+        # the size only scales X and Y, even before the perspective divide
+        self.update_scn_matrix(scale=1 / times)
+
+    def _move_center(self, amount: NDArray[np.float64]) -> None:
+        """
+        Moves the center of the window
+
+        @note In parallel projection this only offsets the window coordinates,
+              in perspective the objects move differently depending on depth
+
+        @param amount: Global coordinates to add to the center
+        """
+        if self._d != 1:
+            self._wcenter = self._wcenter + amount
+            self.update_scn_matrix()
+            return
+
+        offset = -(np.append(amount, 0) @ self.get_scn_matrix())[:3]
+        self._wcenter = self._wcenter + amount
+        self.update_scn_matrix(offset=offset)
 
     def set_angles(self, rx: float, ry: float, rz: float) -> None:
         """
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the modules are imported the same way main.py imports them
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
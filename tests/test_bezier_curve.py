@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from objects.bezier_curve import segment_indices, tessellate_bezier_curve
+
+
+def de_casteljau(control_points: np.ndarray, t: float) -> np.ndarray:
+    """
+    Evaluates a Bezier curve by repeated linear interpolation
+
+    @param control_points: Homogeneous control points of the curve
+    @param t: Parameter from 0 to 1
+
+    @returns: Point of the curve after the homogeneous divide
+    """
+    points = np.array(control_points, dtype=np.float64)
+
+    while len(points) > 1:
+        points = (1 - t) * points[:-1] + t * points[1:]
+
+    return points[0] / points[0][-1]
+
+
+def random_control_points(rng: np.random.Generator, segments: int) -> np.ndarray:
+    """
+    Creates control points of a curve with positive weights
+
+    @param rng: Random generator
+    @param segments: Amount of segments
+
+    @returns: Control points with shape (3 * segments + 1, 4)
+    """
+    control_points = rng.uniform(-100, 100, (3 * segments + 1, 4))
+    control_points[:, 3] = rng.uniform(0.5, 2, len(control_points))
+
+    return control_points
+
+
+@pytest.mark.parametrize("depth", [0, 1, 3, 5])
+def test_tessellation_matches_de_casteljau(depth: int) -> None:
+    control_points = random_control_points(np.random.default_rng(depth), 3)
+    visible = np.ones(3, dtype=np.bool_)
+    polylines = tessellate_bezier_curve(control_points, depth, visible)
+
+    assert polylines.shape == (3, 2 ** depth + 1, 4)
+
+    for segment, polyline in zip(segment_indices(len(control_points)), polylines):
+        for step, point in enumerate(polyline):
+            np.testing.assert_allclose(
+                point,
+                de_casteljau(control_points[segment], step / 2 ** depth),
+                atol=1e-9,
+            )
+
+
+def test_tessellation_builds_only_visible_segments() -> None:
+    control_points = random_control_points(np.random.default_rng(0), 4)
+    visible = np.array([False, True, False, True])
+    polylines = tessellate_bezier_curve(control_points, 2, visible)
+    every = tessellate_bezier_curve(control_points, 2, np.ones(4, dtype=np.bool_))
+
+    np.testing.assert_array_equal(polylines, every[visible])
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from objects.bezier_surface import bezier_patches, tessellate_bezier_surface
+
+
+def de_casteljau(control_points: np.ndarray, t: float) -> np.ndarray:
+    """
+    Evaluates Bezier curves by repeated linear interpolation
+
+    @param control_points: Homogeneous control points with shape (points, ...)
+    @param t: Parameter from 0 to 1
+
+    @returns: Homogeneous point of each curve, before the homogeneous divide
+    """
+    points = np.array(control_points, dtype=np.float64)
+
+    while len(points) > 1:
+        points = (1 - t) * points[:-1] + t * points[1:]
+
+    return points[0]
+
+
+def surface_point(patch: np.ndarray, s: float, t: float) -> np.ndarray:
+    """
+    Evaluates a point of a Bezier patch, first along s then along t
+
+    @param patch: Control points of the patch with shape (4, 4, 4)
+    @param s: Parameter along the rows of the patch
+    @param t: Parameter along the columns of the patch
+
+    @returns: Point of the patch after the homogeneous divide
+    """
+    point = de_casteljau(de_casteljau(patch, s), t)
+
+    return point / point[-1]
+
+
+@pytest.mark.parametrize("depth", [0, 2, 4])
+def test_tessellation_matches_de_casteljau(depth: int) -> None:
+    rng = np.random.default_rng(depth)
+    grid = rng.uniform(-100, 100, (7, 10, 4))
+    grid[..., 3] = rng.uniform(0.5, 2, (7, 10))
+    visible = np.ones(6, dtype=np.bool_)
+    polylines = tessellate_bezier_surface(grid.reshape(-1, 4), grid.shape, depth, visible)
+    lines = 2 ** depth
+    parameters = np.arange(lines + 1) / lines
+    # the curves along t of every patch come first, then the curves along s
+    along_t = polylines[:len(polylines) // 2].reshape(6, lines + 1, lines + 1, 4)
+    along_s = polylines[len(polylines) // 2:].reshape(6, lines + 1, lines + 1, 4)
+
+    assert polylines.shape == (2 * 6 * (lines + 1), lines + 1, 4)
+
+    for patch, curves_t, curves_s in zip(bezier_patches(grid), along_t, along_s):
+        for i, s in enumerate(parameters):
+            for j, t in enumerate(parameters):
+                expected = surface_point(patch, s, t)
+                np.testing.assert_allclose(curves_t[i, j], expected, atol=1e-9)
+                np.testing.assert_allclose(curves_s[j, i], expected, atol=1e-9)
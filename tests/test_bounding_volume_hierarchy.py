@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from objects.bounding_volume_hierarchy import BoundingVolumeHierarchy
+
+
+def random_boxes(rng: np.random.Generator, amount: int) -> np.ndarray:
+    """
+    Creates boxes spread around and beyond the window
+
+    @param rng: Random generator
+    @param amount: Amount of boxes
+
+    @returns: Boxes with shape (amount, 2, 3)
+    """
+    minimum = rng.uniform(-300, 300, (amount, 3))
+
+    return np.stack((minimum, minimum + rng.uniform(0, 40, (amount, 3))), axis=1)
+
+
+def window_matrix(perspective: bool) -> np.ndarray:
+    """
+    Creates a matrix that shows part of the boxes
+
+    @param perspective: Whether W changes with Z, so some boxes cross W = 0
+
+    @returns: Matrix that transforms global coordinates into SCN coordinates
+    """
+    matrix = np.diag([1 / 150, 1 / 100, 1 / 150, 1.])
+    matrix[3, :2] = (0.2, -0.1)
+
+    if perspective:
+        matrix[2, 3] = 1 / 200
+
+    return matrix
+
+
+def brute_force(
+    boxes: np.ndarray,
+    matrix: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Classifies every box on its own
+
+    @param boxes: Boxes with shape (boxes, 2, 3)
+    @param matrix: Matrix that transforms global coordinates into SCN coordinates
+
+    @returns: Indices of the boxes not outside and which of them are inside
+    """
+    outside, inside = BoundingVolumeHierarchy.classify(boxes, matrix)
+
+    return np.flatnonzero(~outside), inside[~outside]
+
+
+@pytest.mark.parametrize("perspective", [False, True])
+def test_query_matches_brute_force(perspective: bool) -> None:
+    boxes = random_boxes(np.random.default_rng(0), 1000)
+    matrix = window_matrix(perspective)
+    hierarchy = BoundingVolumeHierarchy()
+    hierarchy.build(boxes)
+    visible, inside = hierarchy.query(matrix)
+    expected_visible, expected_inside = brute_force(boxes, matrix)
+
+    np.testing.assert_array_equal(visible, expected_visible)
+    np.testing.assert_array_equal(inside, expected_inside)
+
+
+def test_query_after_refit_matches_brute_force() -> None:
+    rng = np.random.default_rng(1)
+    boxes = random_boxes(rng, 1000)
+    matrix = window_matrix(True)
+    hierarchy = BoundingVolumeHierarchy()
+    hierarchy.build(boxes)
+
+    for index in rng.choice(len(boxes), 100, replace=False):
+        boxes[index] = random_boxes(rng, 1)[0]
+        hierarchy.refit(index, boxes[index])
+
+    visible, inside = hierarchy.query(matrix)
+    expected_visible, expected_inside = brute_force(boxes, matrix)
+
+    np.testing.assert_array_equal(visible, expected_visible)
+    np.testing.assert_array_equal(inside, expected_inside)
+
+
+def test_query_of_empty_hierarchy() -> None:
+    hierarchy = BoundingVolumeHierarchy()
+    hierarchy.build(np.empty((0, 2, 3)))
+    visible, inside = hierarchy.query(window_matrix(False))
+
+    assert len(visible) == 0
+    assert len(inside) == 0
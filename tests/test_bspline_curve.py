@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from objects.bspline_curve import MBS, e_array, tessellate_bspline_curve
+
+
+def random_control_points(rng: np.random.Generator, amount: int) -> np.ndarray:
+    """
+    Creates control points of a curve with positive weights
+
+    @param rng: Random generator
+    @param amount: Amount of control points
+
+    @returns: Control points with shape (amount, 4)
+    """
+    control_points = rng.uniform(-100, 100, (amount, 4))
+    control_points[:, 3] = rng.uniform(0.5, 2, amount)
+
+    return control_points
+
+
+def forward_differences_loop(control_points: np.ndarray, n: int) -> np.ndarray:
+    """
+    Steps the forward differences of each span one coordinate at a time,
+    the way the curves were drawn before they were evaluated in batches
+
+    @param control_points: Control points, at least 4
+    @param n: Amount of lines of each span
+
+    @returns: Points of shape (spans, n + 1, 4) after the homogeneous divide
+    """
+    e = e_array(1 / n)
+    spans = []
+
+    for start in range(len(control_points) - 3):
+        # value and differences of each coordinate
+        tables = [e @ (MBS @ column) for column in control_points[start:start + 4].T]
+        points = [[table[0] for table in tables]]
+
+        for _ in range(n):
+            for table in tables:
+                table[0] = table[0] + table[1]
+                table[1] = table[1] + table[2]
+                table[2] = table[2] + table[3]
+
+            points.append([table[0] for table in tables])
+
+        spans.append(points)
+
+    points = np.array(spans)
+
+    return points / points[:, :, -1:]
+
+
+@pytest.mark.parametrize("depth", [0, 1, 4, 7])
+def test_tessellation_matches_forward_differences_loop(depth: int) -> None:
+    control_points = random_control_points(np.random.default_rng(depth), 7)
+    visible = np.ones(4, dtype=np.bool_)
+
+    np.testing.assert_array_equal(
+        tessellate_bspline_curve(control_points, depth, visible),
+        forward_differences_loop(control_points, 2 ** depth),
+    )
+
+
+@pytest.mark.parametrize("depth", [0, 2, 5])
+def test_tessellation_matches_basis_evaluation(depth: int) -> None:
+    control_points = random_control_points(np.random.default_rng(depth), 8)
+    visible = np.array([True, False, True, True, False])
+    polylines = tessellate_bspline_curve(control_points, depth, visible)
+    t = np.arange(2 ** depth + 1) / 2 ** depth
+    powers = np.stack((t ** 3, t ** 2, t, np.ones_like(t)), axis=1)
+
+    assert polylines.shape == (3, 2 ** depth + 1, 4)
+
+    for span, polyline in zip(np.flatnonzero(visible), polylines):
+        points = powers @ MBS @ control_points[span:span + 4]
+        np.testing.assert_allclose(polyline, points / points[:, -1:], atol=1e-9)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from objects.bspline_curve import MBS
+from objects.bspline_surface import tessellate_bspline_surface
+
+
+def surface_point(patch: np.ndarray, s: float, t: float) -> np.ndarray:
+    """
+    Evaluates a point of a B-Spline patch with the basis matrix
+
+    @param patch: Control points of the patch with shape (4, 4, 4)
+    @param s: Parameter along the first axis of the grid
+    @param t: Parameter along the second axis of the grid
+
+    @returns: Point of the patch after the homogeneous divide
+    """
+    s_powers = np.array([s ** 3, s ** 2, s, 1])
+    t_powers = np.array([t ** 3, t ** 2, t, 1])
+    point = np.einsum("i,ijk,j->k", s_powers @ MBS, patch, t_powers @ MBS)
+
+    return point / point[-1]
+
+
+@pytest.mark.parametrize("depth", [0, 2, 4])
+def test_tessellation_matches_basis_evaluation(depth: int) -> None:
+    rng = np.random.default_rng(depth)
+    grid = rng.uniform(-100, 100, (5, 6, 4))
+    grid[..., 3] = rng.uniform(0.5, 2, (5, 6))
+    # patches are ordered along the first axis of the grid first
+    patches = [grid[u:u + 4, v:v + 4] for v in range(3) for u in range(2)]
+    visible = np.array([True, True, False, True, False, True])
+    polylines = tessellate_bspline_surface(
+        grid.reshape(-1, 4),
+        grid.shape,
+        depth,
+        visible,
+    )
+    lines = 2 ** depth
+    parameters = np.arange(lines + 1) / lines
+    # each patch has its curves along t and then its curves along s
+    curves = polylines.reshape(-1, 2, lines + 1, lines + 1, 4)
+
+    assert len(curves) == visible.sum()
+
+    for patch, (along_t, along_s) in zip(np.array(patches)[visible], curves):
+        for i, s in enumerate(parameters):
+            for j, t in enumerate(parameters):
+                expected = surface_point(patch, s, t)
+                np.testing.assert_allclose(along_t[i, j], expected, atol=1e-9)
+                np.testing.assert_allclose(along_s[j, i], expected, atol=1e-9)
@@ -0,0 +1,167 @@
+import numpy as np
+import pytest
+
+from objects.clipping import Clipping, ClippingAlgo
+
+
+def random_edges(rng: np.random.Generator, amount: int) -> np.ndarray:
+    """
+    Creates edges inside, outside and crossing the window, some of them
+    horizontal or vertical
+
+    @param rng: Random generator
+    @param amount: Amount of edges
+
+    @returns: Edges with shape (amount, 2, 4)
+    """
+    edges = np.ones((amount, 2, 4))
+    edges[:, :, :2] = rng.uniform(-3, 3, (amount, 2, 2))
+    # horizontal and vertical edges
+    edges[: amount // 8, 1, 0] = edges[: amount // 8, 0, 0]
+    edges[amount // 8: amount // 4, 1, 1] = edges[amount // 8: amount // 4, 0, 1]
+
+    return edges
+
+
+def homogeneous(points: list[tuple[float, float]]) -> np.ndarray:
+    """
+    Turns 2D points into window coordinates
+
+    @param points: X and Y of each point
+
+    @returns: Vertices with shape (points, 4)
+    """
+    return np.array([(x, y, 0, 1) for x, y in points], dtype=np.float64)
+
+
+POLYLINES = [
+    # leaves the window on the right and comes back
+    [(-0.5, 0), (0.5, 0), (3, 0), (3, 0.5), (0.5, 0.5), (-0.5, 0.5)],
+    # fully outside
+    [(2, 2), (3, 2), (3, 3)],
+    # only the middle vertex is inside
+    [(-2, 0), (0, 0), (0, 2)],
+    # fully inside, right after the end of the previous one
+    [(0.2, 0.2), (0.3, 0.3)],
+]
+"""Polylines clipped together"""
+
+
+def sutherland_hodgman(polygon: np.ndarray) -> np.ndarray:
+    """
+    Textbook Sutherland-Hodgman, one vertex at a time
+
+    @param polygon: Vertices with shape (vertices, 4)
+
+    @returns: Clipped vertices, empty when outside the window
+    """
+    vertices = list(polygon)
+
+    for axis, bound in ((0, -1), (0, 1), (1, -1), (1, 1)):
+        clipped = []
+
+        for current, following in zip(vertices, vertices[1:] + vertices[:1]):
+            current_inside = bound * current[axis] <= 1
+            following_inside = bound * following[axis] <= 1
+
+            if current_inside != following_inside:
+                t = (bound - current[axis]) / (following[axis] - current[axis])
+                intersection = current + t * (following - current)
+                intersection[axis] = bound
+                clipped.append(intersection)
+
+            if following_inside:
+                clipped.append(following)
+
+        vertices = clipped
+
+    return np.array(vertices).reshape(-1, 4)
+
+
+@pytest.mark.parametrize(
+    ("batch", "scalar"),
+    [
+        (Clipping.clip_cohen_sutherland_batch, Clipping.clip_cohen_sutherland),
+        (Clipping.clip_liang_barsky_batch, Clipping.clip_liang_barsky),
+    ],
+)
+def test_batch_line_clipping_matches_scalar(batch, scalar) -> None:
+    edges = random_edges(np.random.default_rng(0), 2000)
+    clipped, visible = batch(edges)
+
+    for edge, batch_edge, batch_visible in zip(edges, clipped, visible):
+        expected = scalar(edge)
+
+        assert batch_visible == (expected is not None)
+
+        if expected is not None:
+            np.testing.assert_allclose(batch_edge, expected)
+
+
+def test_batch_polygon_clipping_matches_scalar() -> None:
+    rng = np.random.default_rng(0)
+    sizes = rng.integers(3, 9, 300)
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+    vertices = np.ones((offsets[-1], 4))
+    vertices[:, :2] = rng.uniform(-3, 3, (offsets[-1], 2))
+    clipped, clipped_offsets = Clipping.clip_sutherland_hodgeman_batch(
+        vertices,
+        offsets,
+    )
+
+    for index in range(len(sizes)):
+        face = vertices[offsets[index]:offsets[index + 1]]
+        batch_face = clipped[clipped_offsets[index]:clipped_offsets[index + 1]]
+        expected = Clipping.clip_sutherland_hodgeman(face)
+
+        if expected is None:
+            assert len(batch_face) == 0
+        else:
+            np.testing.assert_allclose(batch_face, expected)
+
+        np.testing.assert_allclose(batch_face, sutherland_hodgman(face))
+
+
+@pytest.mark.parametrize(
+    "line_clip",
+    [ClippingAlgo.CohenSutherland, ClippingAlgo.LiangBarsky],
+)
+def test_polylines_split_into_visible_runs(line_clip: ClippingAlgo) -> None:
+    vertices = homogeneous([point for polyline in POLYLINES for point in polyline])
+    offsets = np.cumsum([0] + [len(polyline) for polyline in POLYLINES])
+    runs = Clipping.clip_polylines(vertices, offsets, line_clip)
+    expected = [
+        [(-0.5, 0), (0.5, 0), (1, 0)],
+        [(1, 0.5), (0.5, 0.5), (-0.5, 0.5)],
+        [(-1, 0), (0, 0), (0, 1)],
+        [(0.2, 0.2), (0.3, 0.3)],
+    ]
+
+    assert len(runs) == len(expected)
+
+    for run, expected_run in zip(runs, expected):
+        np.testing.assert_allclose(run, homogeneous(expected_run))
+
+
+def test_polylines_split_into_visible_vertices() -> None:
+    vertices = homogeneous([point for polyline in POLYLINES for point in polyline])
+    offsets = np.cumsum([0] + [len(polyline) for polyline in POLYLINES])
+    runs = Clipping.clip_polylines(vertices, offsets, ClippingAlgo.Points)
+    expected = [
+        [(-0.5, 0), (0.5, 0)],
+        [(0.5, 0.5), (-0.5, 0.5)],
+        [(0, 0)],
+        [(0.2, 0.2), (0.3, 0.3)],
+    ]
+
+    assert len(runs) == len(expected)
+
+    for run, expected_run in zip(runs, expected):
+        np.testing.assert_array_equal(run, homogeneous(expected_run))
+
+
+def test_polylines_fully_outside() -> None:
+    vertices = homogeneous(POLYLINES[1])
+
+    for line_clip in (ClippingAlgo.CohenSutherland, ClippingAlgo.LiangBarsky):
+        assert Clipping.clip_polylines(vertices, np.array([0, 3]), line_clip) == []
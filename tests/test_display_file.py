@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from displayFile import DisplayFile
+from objects.bspline_surface import BSplineSurface
+from objects.clipping import ClippingAlgo
+from objects.line import Line
+from tessellationService import TessellationService
+from transformation import translate
+from window import Window
+
+
+def surface(z: float) -> BSplineSurface:
+    """
+    Creates a B-Spline surface in front of the window
+
+    @param z: Depth of the surface
+
+    @returns: The surface
+    """
+    grid = np.ones((4, 5, 4))
+    grid[..., 0] = np.arange(4)[:, None] * 20 - 30
+    grid[..., 1] = np.arange(5)[None, :] * 15 - 30
+    grid[..., 2] = z + np.sin(np.arange(20)).reshape(4, 5) * 10
+
+    return BSplineSurface(f"Surface {z}", (255, 255, 0), grid)
+
+
+@pytest.fixture
+def tessellated_jobs(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    """
+    Records how many objects each call of the tessellation processes receives
+
+    @returns: Amount of objects of each call
+    """
+    jobs: list[int] = []
+    tessellate = TessellationService.tessellate
+
+    def spy(service: TessellationService, objects: list) -> list:
+        jobs.append(len(objects))
+        return tessellate(service, objects)
+
+    monkeypatch.setattr(TessellationService, "tessellate", spy)
+
+    return jobs
+
+
+def test_added_and_transformed_objects_reach_the_processes(
+    tessellated_jobs: list[int],
+) -> None:
+    display_file = DisplayFile(ClippingAlgo.LiangBarsky, workers=2)
+    window = Window(display_file, (0, 0, 0), (200, 200, 0))
+    display_file.set_tessellation_processes(1)
+
+    try:
+        display_file.add(Line("X", (255, 0, 0), (0, 0, 0, 1), (50, 0, 0, 1)))
+        display_file.add(surface(0))
+        window.get_frame()
+
+        assert tessellated_jobs == [1]
+
+        # added after the first frame, like importing a file
+        surfaces = [surface(z) for z in range(10, 60, 10)]
+
+        for obj in surfaces:
+            display_file.add(obj)
+
+        frame = window.get_frame()
+
+        assert tessellated_jobs == [1, len(surfaces)]
+        assert {id(obj) for obj in surfaces} <= {id(obj) for _, obj, _ in frame}
+
+        window.transform_object(surfaces[0], translate(5, 0, 0))
+        window.get_frame()
+
+        assert tessellated_jobs == [1, len(surfaces), 1]
+    finally:
+        display_file.shutdown()
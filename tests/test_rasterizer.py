@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from canvas import (
+    BACKGROUND_COLOUR,
+    CLIPPING_AREA_COLOUR,
+    MARGIN,
+    SELECTED_COLOUR,
+)
+from displayFile import DisplayFile
+from objects.bezier_curve import BezierCurve
+from objects.clipping import ClippingAlgo
+from objects.line import Line
+from objects.polygon import Polygon
+from rasterizer import Rasterizer, darker
+from window import Window
+
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+
+
+@pytest.fixture
+def window() -> Window:
+    """
+    Creates a parallel window 200 units wide over a line, a square and a curve
+
+    @returns: The window
+    """
+    display_file = DisplayFile(ClippingAlgo.LiangBarsky)
+    window = Window(display_file, (0, 0, 0), (200, 200, 0))
+    window.set_projection_parallel()
+    square = [(-80, -80, 0, 1), (-40, -80, 0, 1), (-40, -40, 0, 1), (-80, -40, 0, 1)]
+    display_file.add(Line("Line", RED, (-50, 0, 0, 1), (50, 0, 0, 1)))
+    display_file.add(Polygon("Square", GREEN, square, [tuple(square)]))
+    display_file.add(BezierCurve(
+        "Curve",
+        RED,
+        [(0, 50, 0, 1), (30, 90, 0, 1), (60, 10, 0, 1), (90, 50, 0, 1)],
+    ))
+
+    return window
+
+
+def pixel(image: np.ndarray, x: int, y: int) -> tuple[int, ...]:
+    """
+    Reads the colour of a pixel without its alpha
+
+    @param image: RGBA image
+    @param x: Column of the pixel
+    @param y: Row of the pixel
+
+    @returns: The colour
+    """
+    return tuple(int(value) for value in image[y, x, :3])
+
+
+def vertex_counts(frame: list) -> list[int]:
+    """
+    Counts the vertices of each object of a frame
+
+    @param frame: Frame to count
+
+    @returns: Amount of vertices of each object
+    """
+    return [sum(map(len, coordinates)) for _, _, coordinates in frame]
+
+
+def test_draw(window: Window) -> None:
+    # the clipping area is 100 pixels wide, so 1 pixel is 2 units
+    image = Rasterizer(window, 100 + 2 * MARGIN, 100 + 2 * MARGIN).draw(-1)
+
+    assert image.shape == (140, 140, 4)
+    assert (image[..., 3] == 255).all()
+    assert pixel(image, 5, 5) == BACKGROUND_COLOUR
+    assert pixel(image, MARGIN, 70) == CLIPPING_AREA_COLOUR
+    assert pixel(image, MARGIN + 100, 70) == CLIPPING_AREA_COLOUR
+    # the line goes from (45, 70) to (95, 70)
+    assert pixel(image, 70, 70) == RED
+    assert pixel(image, 70, 75) == BACKGROUND_COLOUR
+    # the square goes from (30, 90) to (50, 110)
+    assert pixel(image, 40, 100) == GREEN
+    assert pixel(image, 30, 100) == darker(GREEN)
+    # the curve starts at (70, 45) and ends at (115, 45)
+    assert pixel(image, 70, 45) == RED
+    assert pixel(image, 115, 45) == RED
+
+
+def test_draw_selected(window: Window) -> None:
+    image = Rasterizer(window, 100 + 2 * MARGIN, 100 + 2 * MARGIN).draw(1)
+
+    assert pixel(image, 70, 70) == RED
+    # only the outline of the selected square is highlighted
+    assert pixel(image, 30, 100) == SELECTED_COLOUR
+    assert pixel(image, 40, 100) == GREEN
+
+
+def test_draw_keeps_the_window_tolerance(window: Window) -> None:
+    window.set_tessellation_tolerance(0.1)
+    vertices = vertex_counts(window.get_frame())
+    Rasterizer(window, 1000, 1000).draw(-1)
+
+    assert vertex_counts(window.get_frame()) == vertices
+    # the image is large enough for the curve to need more lines
+    assert vertex_counts(window.get_frame(0.001)) != vertices
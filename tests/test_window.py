@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+
+from displayFile import DisplayFile
+from objects.bezier_curve import BezierCurve
+from objects.bspline_surface import BSplineSurface
+from objects.clipping import ClippingAlgo
+from objects.geometricObject import GeometricObject
+from objects.line import Line
+from objects.polygon import Polygon
+from objects.wireframe import Wireframe
+from window import Window
+
+PAN_AND_ZOOM = [("move", 0.1, -0.05), ("zoom", 0.8), ("move", -0.3, 0.2), ("zoom", 1.5)]
+"""Window changes applied one after the other"""
+
+
+def scene() -> list[GeometricObject]:
+    """
+    Creates objects of every kind of primitive, some of them crossing the window
+
+    @returns: The objects
+    """
+    rng = np.random.default_rng(0)
+    points = [tuple(rng.uniform(-150, 150, 3)) + (1,) for _ in range(20)]
+    square = [(-120, -20, 0, 1), (20, -20, 0, 1), (20, 150, 0, 1), (-20, 20, 0, 1)]
+
+    return [
+        Line("X", (255, 0, 0), (0, 0, 0, 1), (50, 0, 0, 1)),
+        Line("Far", (255, 0, 0), (-500, 0, 0, 1), (500, 30, 0, 1)),
+        Polygon("Square", (0, 255, 0), square, [tuple(square)]),
+        Wireframe(
+            "Wires",
+            (0, 0, 255),
+            points,
+            [(points[i], points[i + 1]) for i in range(len(points) - 1)],
+        ),
+        BezierCurve("Curve", (9, 9, 9), points[:7]),
+        BSplineSurface(
+            "Surface",
+            (255, 255, 0),
+            np.array(points).reshape(4, 5, 4),
+        ),
+    ]
+
+
+def create_window(parallel: bool) -> Window:
+    """
+    Creates a rotated window over the scene
+
+    @param parallel: Whether the projection is parallel instead of perspective
+
+    @returns: The window
+    """
+    display_file = DisplayFile(ClippingAlgo.LiangBarsky)
+    window = Window(display_file, (0, 0, 0), (200, 200, 0))
+
+    for obj in scene():
+        display_file.add(obj)
+
+    if parallel:
+        window.set_projection_parallel()
+
+    window.yaw(20)
+    window.pitch(10)
+
+    return window
+
+
+def apply(window: Window, change: tuple) -> None:
+    """
+    Applies a window change of `PAN_AND_ZOOM`
+
+    @param window: Window to change
+    @param change: Name of the method followed by its arguments
+    """
+    getattr(window, change[0])(*change[1:])
+
+
+def assert_same_frames(frame: list, expected: list) -> None:
+    """
+    Compares the window coordinates of two frames of the same scene
+
+    @param frame: Frame to check
+    @param expected: Frame evaluated from scratch
+    """
+    assert [index for index, _, _ in frame] == [index for index, _, _ in expected]
+
+    for (_, _, coordinates), (_, _, expected_coordinates) in zip(frame, expected):
+        assert len(coordinates) == len(expected_coordinates)
+
+        for primitive, expected_primitive in zip(coordinates, expected_coordinates):
+            np.testing.assert_allclose(primitive, expected_primitive, atol=1e-9)
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_pan_and_zoom_match_a_new_projection(parallel: bool) -> None:
+    window = create_window(parallel)
+    window.get_frame()
+
+    for step in range(len(PAN_AND_ZOOM)):
+        apply(window, PAN_AND_ZOOM[step])
+        # a window that never drew has nothing to reuse
+        expected = create_window(parallel)
+
+        for change in PAN_AND_ZOOM[:step + 1]:
+            apply(expected, change)
+
+        assert_same_frames(window.get_frame(), expected.get_frame())
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_only_parallel_pan_reuses_window_coordinates(
+    parallel: bool,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    reused: list[bool] = []
+    reuse_window_coordinates = GeometricObject.reuse_window_coordinates
+
+    def spy(obj: GeometricObject, inside: bool = False) -> bool:
+        reused.append(reuse_window_coordinates(obj, inside))
+        return reused[-1]
+
+    monkeypatch.setattr(GeometricObject, "reuse_window_coordinates", spy)
+    window = create_window(parallel)
+    window.get_frame()
+    reused.clear()
+    window.move(0.1, -0.05)
+    window.get_frame()
+
+    assert len(reused) > 0
+    assert any(reused) == parallel